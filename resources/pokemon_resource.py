@@ -3,12 +3,63 @@ Pokémon Resource Module
 Handles fetching Pokémon data from PokéAPI and exposing it as MCP resources.
 """
 
-import requests
-import json
-from typing import Dict, List, Any, Optional
-from pydantic import BaseModel
+import asyncio
+import contextvars
+import httpx
+import msgspec
+import orjson
+from cachetools import TTLCache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
-class PokemonStats(BaseModel):
+# PokéAPI stat names mapped to our keys, in the order they are reported
+_STAT_NAMES = {
+    'hp': 'hp',
+    'attack': 'attack',
+    'defense': 'defense',
+    'special-attack': 'special_attack',
+    'special-defense': 'special_defense',
+    'speed': 'speed',
+}
+
+# Sprite options in order of preference
+_SPRITE_PATHS = (
+    ('other', 'official-artwork', 'front_default'),
+    ('front_default',),
+    ('other', 'home', 'front_default'),
+)
+
+def _pick_sprite(sprites: Dict[str, Any]) -> Optional[str]:
+    """Return the first available sprite URL from _SPRITE_PATHS."""
+    for path in _SPRITE_PATHS:
+        node = sprites
+        for key in path:
+            node = node.get(key) if isinstance(node, dict) else None
+            if node is None:
+                break
+        if node and isinstance(node, str):
+            return node
+    return None
+
+def _evolution_node(chain_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'species_name': chain_data['species']['name'],
+        'evolves_to': [],
+        'evolution_details': chain_data.get('evolution_details', [])
+    }
+
+def _parse_evolution_chain(root: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a PokéAPI evolution chain into nested dicts, walking it iteratively."""
+    result = _evolution_node(root)
+    stack = [(root, result)]
+    while stack:
+        chain_data, node = stack.pop()
+        for evolution in chain_data.get('evolves_to', ()):
+            child = _evolution_node(evolution)
+            node['evolves_to'].append(child)
+            stack.append((evolution, child))
+    return result
+
+class PokemonStats(msgspec.Struct):
     hp: int
     attack: int
     defense: int
@@ -16,15 +67,15 @@ class PokemonStats(BaseModel):
     special_defense: int
     speed: int
 
-class PokemonType(BaseModel):
+class PokemonType(msgspec.Struct):
     name: str
     slot: int
 
-class PokemonAbility(BaseModel):
+class PokemonAbility(msgspec.Struct):
     name: str
     is_hidden: bool
 
-class PokemonMove(BaseModel):
+class PokemonMove(msgspec.Struct):
     name: str
     power: Optional[int]
     accuracy: Optional[int]
@@ -33,7 +84,7 @@ class PokemonMove(BaseModel):
     damage_class: str
     effect: Optional[str]
 
-class PokemonData(BaseModel):
+class PokemonData(msgspec.Struct):
     id: int
     name: str
     height: int
@@ -44,19 +95,154 @@ class PokemonData(BaseModel):
     abilities: List[PokemonAbility]
     moves: List[PokemonMove]
 
-class EvolutionChain(BaseModel):
+class EvolutionChain(msgspec.Struct):
     species_name: str
     evolves_to: List['EvolutionChain']
     evolution_details: List[Dict[str, Any]]
 
+# Wire format of the PokéAPI /move endpoint. Only the fields listed here are
+# decoded; the rest of the (large) payload is skipped by the decoder.
+class _NamedResource(msgspec.Struct):
+    name: str
+
+class _EffectEntry(msgspec.Struct):
+    short_effect: str
+    language: _NamedResource
+
+class _MovePayload(msgspec.Struct):
+    name: str
+    power: Optional[int]
+    accuracy: Optional[int]
+    pp: Optional[int]
+    type: _NamedResource
+    damage_class: _NamedResource
+    effect_entries: List[_EffectEntry] = []
+
+_move_decoder = msgspec.json.Decoder(_MovePayload)
+
+# PP for moves PokéAPI reports without one, matching the fallback move
+_DEFAULT_MOVE_PP = 10
+
+# Failures while fetching or parsing a PokéAPI payload; surfaced to callers as RuntimeError
+_FETCH_ERRORS = (httpx.HTTPError, orjson.JSONDecodeError, KeyError)
+
+# Set while warming the cache; inherited by the tasks a warm-up spawns
+_background_fetch = contextvars.ContextVar('background_fetch', default=False)
+
 class PokemonResource:
     """Handles Pokémon data fetching from PokéAPI."""
     
     BASE_URL = "https://pokeapi.co/api/v2"
     
+    # PokéAPI data is effectively static, so entries can live for a day;
+    # the size bound keeps long-running servers from growing without limit.
+    CACHE_MAX_ENTRIES = 2048
+    CACHE_TTL_SECONDS = 24 * 60 * 60
+    
+    # Bursting all move lookups at once trips PokéAPI's rate limiting
+    MAX_CONCURRENT_FETCHES = 8
+    # Slots of that limit background warm-up may hold, so interactive lookups never queue behind it
+    MAX_BACKGROUND_FETCHES = 2
+    
+    REQUEST_TIMEOUT_SECONDS = 5.0
+    # Retries cover connection failures only; HTTP error statuses are not retried
+    CONNECT_RETRIES = 3
+    
     def __init__(self):
-        self.session = requests.Session()
-        self.cache = {}
+        self.cache = TTLCache(maxsize=self.CACHE_MAX_ENTRIES, ttl=self.CACHE_TTL_SECONDS)
+        self._session: Optional[httpx.AsyncClient] = None
+        self._fetch_semaphore: Optional[asyncio.Semaphore] = None
+        self._background_semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Fetches currently in progress, keyed like the cache, with whether each runs as background
+        self._inflight: Dict[str, Tuple[asyncio.Task, bool]] = {}
+        # Closes of clients replaced by a loop switch, kept referenced until they finish
+        self._closing: Set[asyncio.Task] = set()
+    
+    def _bind_loop(self) -> None:
+        """Lazily create the HTTP client and fetch limiter for the running event loop."""
+        loop = asyncio.get_running_loop()
+        # Pooled connections and semaphores are bound to the loop that created them
+        if self._loop is not loop:
+            if self._session is not None:
+                self._close_stale_session(self._session, self._loop)
+            # HTTP/2 multiplexes concurrent lookups over a few long-lived connections
+            self._session = httpx.AsyncClient(
+                base_url=self.BASE_URL,
+                timeout=self.REQUEST_TIMEOUT_SECONDS,
+                transport=httpx.AsyncHTTPTransport(
+                    http2=True,
+                    retries=self.CONNECT_RETRIES,
+                    limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+                )
+            )
+            self._fetch_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_FETCHES)
+            self._background_semaphore = asyncio.Semaphore(self.MAX_BACKGROUND_FETCHES)
+            self._loop = loop
+    
+    def _close_stale_session(self, session: httpx.AsyncClient, session_loop: asyncio.AbstractEventLoop) -> None:
+        """Close a client left behind by another event loop, on that loop if it is still running."""
+        if session_loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.aclose(), session_loop)
+            return
+        task = asyncio.ensure_future(self._discard_session(session))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+    
+    @staticmethod
+    async def _discard_session(session: httpx.AsyncClient) -> None:
+        # Connections opened on a closed loop cannot shut down cleanly; the client is still marked closed
+        try:
+            await session.aclose()
+        except RuntimeError:
+            pass
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client; a later request opens a new one."""
+        session, self._session, self._loop = self._session, None, None
+        if session is not None:
+            await session.aclose()
+    
+    @property
+    def session(self) -> httpx.AsyncClient:
+        self._bind_loop()
+        return self._session
+    
+    async def _get(self, url: str) -> httpx.Response:
+        """GET a PokéAPI URL, keeping at most MAX_CONCURRENT_FETCHES requests in flight."""
+        self._bind_loop()
+        if _background_fetch.get():
+            async with self._background_semaphore, self._fetch_semaphore:
+                response = await self._session.get(url)
+        else:
+            async with self._fetch_semaphore:
+                response = await self._session.get(url)
+        response.raise_for_status()
+        return response
+    
+    async def _coalesce(self, cache_key: str, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Share a single in-flight fetch between concurrent callers of the same key.
+        An interactive caller does not wait on a background fetch; it starts its own,
+        which later callers of the key share instead.
+        """
+        background = _background_fetch.get()
+        entry = self._inflight.get(cache_key)
+        if (entry is None or entry[0].get_loop() is not asyncio.get_running_loop()
+                or (entry[1] and not background)):
+            task = asyncio.ensure_future(fetch())
+            self._inflight[cache_key] = (task, background)
+            
+            def forget(done: asyncio.Task) -> None:
+                current = self._inflight.get(cache_key)
+                if current is not None and current[0] is done:
+                    del self._inflight[cache_key]
+            
+            task.add_done_callback(forget)
+        else:
+            task = entry[0]
+        # Shield so one cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(task)
     
     async def get_pokemon_stats(self, pokemon_name: str) -> Dict[str, Any]:
         """Get comprehensive Pokémon stats, types, abilities, and moves."""
@@ -67,17 +253,21 @@ class PokemonResource:
         if cache_key in self.cache:
             return self.cache[cache_key]
         
+        return await self._coalesce(cache_key, lambda: self._fetch_pokemon_stats(pokemon_name, cache_key))
+    
+    async def _fetch_pokemon_stats(self, pokemon_name: str, cache_key: str) -> Dict[str, Any]:
+        """Fetch and parse Pokémon data from PokéAPI, storing it under cache_key."""
         try:
             # Fetch basic Pokémon data
-            pokemon_response = self.session.get(f"{self.BASE_URL}/pokemon/{pokemon_name}")
-            pokemon_response.raise_for_status()
-            pokemon_data = pokemon_response.json()
+            pokemon_response = await self._get(f"/pokemon/{pokemon_name}")
+            pokemon_data = orjson.loads(pokemon_response.content)
             
             # Parse stats
-            stats = {}
+            stats = dict.fromkeys(_STAT_NAMES.values(), 0)
             for stat in pokemon_data['stats']:
-                stat_name = stat['stat']['name'].replace('-', '_')
-                stats[stat_name] = stat['base_stat']
+                stat_name = _STAT_NAMES.get(stat['stat']['name'])
+                if stat_name:
+                    stats[stat_name] = stat['base_stat']
             
             # Parse types
             types = []
@@ -95,21 +285,16 @@ class PokemonResource:
                     'is_hidden': ability_info['is_hidden']
                 })
             
-            # Parse moves (limit to first 20 for performance)
-            moves = []
-            for move_info in pokemon_data['moves'][:20]:
-                move_name = move_info['move']['name']
-                move_details = await self._get_move_details(move_name)
-                moves.append(move_details)
+            # Parse moves (limit to first 20 for performance), fetched concurrently
+            move_results = await asyncio.gather(
+                *[self._get_move_details(move_info['move']['name'])
+                  for move_info in pokemon_data['moves'][:20]],
+                return_exceptions=True
+            )
+            moves = [move for move in move_results if not isinstance(move, BaseException)]
             
             # Get sprite URL
-            sprite_url = None
-            if pokemon_data.get('sprites'):
-                sprites = pokemon_data['sprites']
-                # Try different sprite options in order of preference
-                sprite_url = (sprites.get('other', {}).get('official-artwork', {}).get('front_default') or
-                             sprites.get('front_default') or
-                             sprites.get('other', {}).get('home', {}).get('front_default'))
+            sprite_url = _pick_sprite(pokemon_data['sprites']) if pokemon_data.get('sprites') else None
             
             result = {
                 'id': pokemon_data['id'],
@@ -118,14 +303,7 @@ class PokemonResource:
                 'weight': pokemon_data['weight'],
                 'base_experience': pokemon_data['base_experience'],
                 'sprite': sprite_url,
-                'stats': {
-                    'hp': stats.get('hp', 0),
-                    'attack': stats.get('attack', 0),
-                    'defense': stats.get('defense', 0),
-                    'special_attack': stats.get('special_attack', 0),
-                    'special_defense': stats.get('special_defense', 0),
-                    'speed': stats.get('speed', 0)
-                },
+                'stats': stats,
                 'types': types,
                 'abilities': abilities,
                 'moves': moves
@@ -135,8 +313,8 @@ class PokemonResource:
             self.cache[cache_key] = result
             return result
             
-        except requests.RequestException as e:
-            raise Exception(f"Failed to fetch Pokémon data for {pokemon_name}: {str(e)}")
+        except _FETCH_ERRORS as e:
+            raise RuntimeError(f"Failed to fetch Pokémon data for {pokemon_name}: {str(e)}") from e
     
     async def _get_move_details(self, move_name: str) -> Dict[str, Any]:
         """Get detailed information about a specific move."""
@@ -144,44 +322,59 @@ class PokemonResource:
         if cache_key in self.cache:
             return self.cache[cache_key]
         
+        return await self._coalesce(cache_key, lambda: self._fetch_move_details(move_name, cache_key))
+    
+    async def _fetch_move_details(self, move_name: str, cache_key: str) -> Dict[str, Any]:
+        """Fetch move data from PokéAPI, storing it under cache_key."""
         try:
-            move_response = self.session.get(f"{self.BASE_URL}/move/{move_name}")
-            move_response.raise_for_status()
-            move_data = move_response.json()
+            move_response = await self._get(f"/move/{move_name}")
+            move_data = _move_decoder.decode(move_response.content)
             
             # Get effect description
             effect = None
-            if move_data.get('effect_entries'):
-                for entry in move_data['effect_entries']:
-                    if entry['language']['name'] == 'en':
-                        effect = entry['short_effect']
-                        break
+            for entry in move_data.effect_entries:
+                if entry.language.name == 'en':
+                    effect = entry.short_effect
+                    break
             
             result = {
-                'name': move_data['name'],
-                'power': move_data['power'],
-                'accuracy': move_data['accuracy'],
-                'pp': move_data['pp'],
-                'type': move_data['type']['name'],
-                'damage_class': move_data['damage_class']['name'],
+                'name': move_data.name,
+                'power': move_data.power,
+                'accuracy': move_data.accuracy,
+                'pp': move_data.pp if move_data.pp is not None else _DEFAULT_MOVE_PP,
+                'type': move_data.type.name,
+                'damage_class': move_data.damage_class.name,
                 'effect': effect
             }
             
             self.cache[cache_key] = result
             return result
             
-        except requests.RequestException:
+        except (httpx.HTTPError, msgspec.DecodeError):
             # Return basic move info if detailed fetch fails
             return {
                 'name': move_name,
                 'power': None,
                 'accuracy': None,
-                'pp': 10,
+                'pp': _DEFAULT_MOVE_PP,
                 'type': 'normal',
                 'damage_class': 'physical',
                 'effect': None
             }
     
+    async def warm(self, pokemon_names: List[str]) -> List[Any]:
+        """
+        Prefetch several Pokémon at low priority, holding at most MAX_BACKGROUND_FETCHES
+        request slots. Returns results with exceptions in place of failures.
+        """
+        # Tasks copy the context they are created in, so only these fetches run as background
+        token = _background_fetch.set(True)
+        try:
+            fetches = [asyncio.ensure_future(self.get_pokemon_stats(name)) for name in pokemon_names]
+        finally:
+            _background_fetch.reset(token)
+        return await asyncio.gather(*fetches, return_exceptions=True)
+    
     async def get_evolution_chain(self, pokemon_name: str) -> Dict[str, Any]:
         """Get evolution chain information for a Pokémon."""
         pokemon_name = pokemon_name.lower().strip()
@@ -190,34 +383,23 @@ class PokemonResource:
         if cache_key in self.cache:
             return self.cache[cache_key]
         
+        return await self._coalesce(cache_key, lambda: self._fetch_evolution_chain(pokemon_name, cache_key))
+    
+    async def _fetch_evolution_chain(self, pokemon_name: str, cache_key: str) -> Dict[str, Any]:
+        """Fetch and parse an evolution chain from PokéAPI, storing it under cache_key."""
         try:
             # First get the Pokémon species data
-            species_response = self.session.get(f"{self.BASE_URL}/pokemon-species/{pokemon_name}")
-            species_response.raise_for_status()
-            species_data = species_response.json()
+            species_response = await self._get(f"/pokemon-species/{pokemon_name}")
+            species_data = orjson.loads(species_response.content)
             
             # Get the evolution chain URL
             evolution_chain_url = species_data['evolution_chain']['url']
             
             # Fetch evolution chain data
-            evolution_response = self.session.get(evolution_chain_url)
-            evolution_response.raise_for_status()
-            evolution_data = evolution_response.json()
-            
-            # Parse evolution chain
-            def parse_evolution_chain(chain_data):
-                result = {
-                    'species_name': chain_data['species']['name'],
-                    'evolves_to': [],
-                    'evolution_details': chain_data.get('evolution_details', [])
-                }
-                
-                for evolution in chain_data.get('evolves_to', []):
-                    result['evolves_to'].append(parse_evolution_chain(evolution))
-                
-                return result
-            
-            evolution_chain = parse_evolution_chain(evolution_data['chain'])
+            evolution_response = await self._get(evolution_chain_url)
+            evolution_data = orjson.loads(evolution_response.content)
+            
+            evolution_chain = _parse_evolution_chain(evolution_data['chain'])
             
             result = {
                 'id': evolution_data['id'],
@@ -227,8 +409,8 @@ class PokemonResource:
             self.cache[cache_key] = result
             return result
             
-        except requests.RequestException as e:
-            raise Exception(f"Failed to fetch evolution data for {pokemon_name}: {str(e)}")
+        except _FETCH_ERRORS as e:
+            raise RuntimeError(f"Failed to fetch evolution data for {pokemon_name}: {str(e)}") from e
     
     async def get_pokemon_by_name(self, pokemon_name: str) -> Dict[str, Any]:
         """Get basic Pokémon data for battle simulation."""
@@ -3,24 +3,40 @@ Pokémon Battle Simulation MCP Server
 Main FastAPI server implementing Model Context Protocol for Pokémon battles.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
+import orjson
 import uvicorn
 
 from resources.pokemon_resource import PokemonResource
 from tools.battle_tool import BattleTool
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release pooled PokéAPI connections on shutdown
+    await pokemon_resource.aclose()
+
 app = FastAPI(
     title="Pokémon Battle Simulation MCP Server",
     description="MCP server for Pokémon data and battle simulation",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Initialize resources and tools
 pokemon_resource = PokemonResource()
-battle_tool = BattleTool()
+battle_tool = BattleTool(pokemon_resource)
 
 # MCP Protocol Models
 class MCPResource(BaseModel):
@@ -53,39 +69,78 @@ class MCPToolResult(BaseModel):
     content: List[Dict[str, Any]]
     isError: Optional[bool] = False
 
+# Static MCP listings, built and serialized once at import time
+RESOURCE_LIST = MCPResourceResponse(resources=[
+    MCPResource(
+        uri="pokemon://stats/{pokemon_name}",
+        name="pokemon_stats",
+        description="Get Pokémon base stats, types, abilities, and moves",
+        mimeType="application/json"
+    ),
+    MCPResource(
+        uri="pokemon://evolution/{pokemon_name}",
+        name="pokemon_evolution",
+        description="Get Pokémon evolution chain information",
+        mimeType="application/json"
+    )
+])
+
+TOOL_LIST = MCPToolResponse(tools=[
+    MCPTool(
+        name="pokemon_battle",
+        description="Simulate a battle between two Pokémon",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "pokemon1": {
+                    "type": "string",
+                    "description": "Name of the first Pokémon"
+                },
+                "pokemon2": {
+                    "type": "string",
+                    "description": "Name of the second Pokémon"
+                },
+                "moves1": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional list of moves for first Pokémon",
+                    "maxItems": 4
+                },
+                "moves2": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional list of moves for second Pokémon",
+                    "maxItems": 4
+                }
+            },
+            "required": ["pokemon1", "pokemon2"]
+        }
+    )
+])
+
+_RESOURCE_LIST_BYTES = orjson.dumps(RESOURCE_LIST.model_dump())
+_TOOL_LIST_BYTES = orjson.dumps(TOOL_LIST.model_dump())
+_SERVER_INFO_BYTES = orjson.dumps({
+    "name": "Pokémon Battle Simulation MCP Server",
+    "version": "1.0.0",
+    "description": "MCP server for Pokémon data and battle simulation using PokéAPI",
+    "endpoints": {
+        "resources": "/resources",
+        "tools": "/tools",
+        "resources/read": "/resources/read",
+        "tools/call": "/tools/call"
+    }
+})
+
 @app.get("/")
 async def root():
     """Root endpoint with server information."""
-    return {
-        "name": "Pokémon Battle Simulation MCP Server",
-        "version": "1.0.0",
-        "description": "MCP server for Pokémon data and battle simulation using PokéAPI",
-        "endpoints": {
-            "resources": "/resources",
-            "tools": "/tools",
-            "resources/read": "/resources/read",
-            "tools/call": "/tools/call"
-        }
-    }
+    return Response(content=_SERVER_INFO_BYTES, media_type="application/json")
 
-@app.get("/resources", response_model=MCPResourceResponse)
+@app.get("/resources")
 async def list_resources():
     """List available MCP resources."""
-    resources = [
-        MCPResource(
-            uri="pokemon://stats/{pokemon_name}",
-            name="pokemon_stats",
-            description="Get Pokémon base stats, types, abilities, and moves",
-            mimeType="application/json"
-        ),
-        MCPResource(
-            uri="pokemon://evolution/{pokemon_name}",
-            name="pokemon_evolution",
-            description="Get Pokémon evolution chain information",
-            mimeType="application/json"
-        )
-    ]
-    return MCPResourceResponse(resources=resources)
+    return Response(content=_RESOURCE_LIST_BYTES, media_type="application/json")
 
 @app.post("/resources/read")
 async def read_resource(request: Dict[str, str]):
@@ -99,7 +154,7 @@ async def read_resource(request: Dict[str, str]):
             return MCPResourceContent(
                 uri=uri,
                 mimeType="application/json",
-                text=str(data)
+                text=orjson.dumps(data).decode()
             )
         elif uri.startswith("pokemon://evolution/"):
             pokemon_name = uri.split("/")[-1]
@@ -107,49 +162,17 @@ async def read_resource(request: Dict[str, str]):
             return MCPResourceContent(
                 uri=uri,
                 mimeType="application/json",
-                text=str(data)
+                text=orjson.dumps(data).decode()
             )
         else:
             raise HTTPException(status_code=404, detail="Resource not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/tools", response_model=MCPToolResponse)
+@app.get("/tools")
 async def list_tools():
     """List available MCP tools."""
-    tools = [
-        MCPTool(
-            name="pokemon_battle",
-            description="Simulate a battle between two Pokémon",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "pokemon1": {
-                        "type": "string",
-                        "description": "Name of the first Pokémon"
-                    },
-                    "pokemon2": {
-                        "type": "string",
-                        "description": "Name of the second Pokémon"
-                    },
-                    "moves1": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Optional list of moves for first Pokémon",
-                        "maxItems": 4
-                    },
-                    "moves2": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Optional list of moves for second Pokémon",
-                        "maxItems": 4
-                    }
-                },
-                "required": ["pokemon1", "pokemon2"]
-            }
-        )
-    ]
-    return MCPToolResponse(tools=tools)
+    return Response(content=_TOOL_LIST_BYTES, media_type="application/json")
 
 @app.post("/tools/call")
 async def call_tool(request: MCPToolCall):
@@ -5,10 +5,13 @@ Interactive web interface for the Pokémon Battle Simulation system.
 
 import streamlit as st
 import asyncio
-import json
-import requests
-from typing import List, Dict, Any, Optional
+import atexit
+import re
+import threading
+from typing import List, Dict, Any, Tuple
 import time
+from collections import deque
+from pathlib import Path
 
 # Import our battle system components
 from resources.pokemon_resource import PokemonResource
@@ -23,449 +26,184 @@ st.set_page_config(
 )
 
 # Enhanced Pokemon-themed CSS for production deployment
-st.markdown("""
-<style>
-    /* Force CSS override for Streamlit production */
-    .stApp > div:first-child {
-        background: linear-gradient(135deg, #ff6b6b 0%, #4ecdc4 25%, #45b7d1 50%, #f9ca24 75%, #f0932b 100%) !important;
-        background-size: 400% 400% !important;
-        animation: gradientShift 8s ease infinite !important;
-    }
-    
-    .main .block-container {
-        background: rgba(255,255,255,0.1) !important;
-        backdrop-filter: blur(10px) !important;
-        border-radius: 20px !important;
-        padding: 2rem !important;
-        margin-top: 1rem !important;
-    }
-    
-    .main {
-        background: linear-gradient(135deg, #ff6b6b 0%, #4ecdc4 25%, #45b7d1 50%, #f9ca24 75%, #f0932b 100%);
-        background-size: 400% 400%;
-        animation: gradientShift 8s ease infinite;
-        min-height: 100vh;
-    }
-    
-    @keyframes gradientShift {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-    
-    .main-header {
-        text-align: center;
-        font-family: 'Courier New', 'Monaco', 'Menlo', monospace;
-        font-size: 2rem;
-        font-weight: bold;
-        color: #fff !important;
-        text-shadow: 3px 3px 0px #000, -1px -1px 0px #000, 1px -1px 0px #000, -1px 1px 0px #000;
-        margin: 2rem 0;
-        padding: 1rem;
-        background: rgba(0,0,0,0.5) !important;
-        border-radius: 20px;
-        animation: bounce 2s infinite;
-    }
-    
-    @keyframes bounce {
-        0%, 20%, 50%, 80%, 100% { transform: translateY(0); }
-        40% { transform: translateY(-10px); }
-        60% { transform: translateY(-5px); }
-    }
-    
-    .pokemon-card {
-        background: linear-gradient(145deg, #fff 0%, #f8f9fa 100%);
-        border: 4px solid #333;
-        border-radius: 25px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        box-shadow: 0 8px 32px rgba(0,0,0,0.3), inset 0 2px 8px rgba(255,255,255,0.8);
-        transition: all 0.3s ease;
-        position: relative;
-    }
-    
-    .pokemon-card::before {
-        content: '';
-        position: absolute;
-        top: -2px;
-        left: -2px;
-        right: -2px;
-        bottom: -2px;
-        background: linear-gradient(45deg, #ff6b6b, #4ecdc4, #45b7d1, #f9ca24);
-        border-radius: 25px;
-        z-index: -1;
-        animation: cardGlow 3s ease-in-out infinite alternate;
-    }
-    
-    @keyframes cardGlow {
-        from { opacity: 0.7; }
-        to { opacity: 1; }
-    }
-    
-    .pokemon-card:hover {
-        transform: translateY(-8px) scale(1.02);
-        box-shadow: 0 15px 40px rgba(0,0,0,0.4);
-    }
-    
-    .battle-arena {
-        background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%);
-        border: 3px solid #ecf0f1;
-        border-radius: 20px;
-        padding: 2rem;
-        margin: 1rem 0;
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .battle-arena::before {
-        content: '⚡⚡⚡⚡⚡⚡⚡⚡⚡⚡';
-        position: absolute;
-        top: 10px;
-        left: 0;
-        right: 0;
-        text-align: center;
-        font-size: 1.5rem;
-        color: #f1c40f;
-        animation: sparkle 1.5s infinite;
-    }
-    
-    @keyframes sparkle {
-        0%, 100% { opacity: 1; }
-        50% { opacity: 0.3; }
-    }
-    
-    .battle-log {
-        background: linear-gradient(135deg, #0c0c0c 0%, #1a1a1a 100%);
-        color: #00ff41;
-        padding: 1.5rem;
-        border-radius: 15px;
-        font-family: 'Courier New', monospace;
-        max-height: 400px;
-        overflow-y: auto;
-        border: 3px solid #00ff41;
-        box-shadow: 0 0 20px rgba(0,255,65,0.5), inset 0 0 20px rgba(0,255,65,0.1);
-        position: relative;
-    }
-    
-    .battle-log::before {
-        content: '> BATTLE SYSTEM ONLINE';
-        position: absolute;
-        top: -15px;
-        left: 20px;
-        background: #0c0c0c;
-        padding: 0 10px;
-        color: #00ff41;
-        font-weight: bold;
-    }
-    
-    .pokemon-name {
-        font-family: 'Courier New', 'Monaco', monospace;
-        font-size: 1.2rem;
-        font-weight: bold;
-        text-align: center;
-        margin: 1rem 0;
-        color: #2c3e50 !important;
-        text-shadow: 2px 2px 0px #fff;
-    }
-    
-    .vs-container {
-        text-align: center;
-        font-family: 'Courier New', 'Monaco', monospace;
-        font-size: 1.8rem;
-        font-weight: bold;
-        color: #e74c3c !important;
-        text-shadow: 2px 2px 0px #fff;
-        margin: 2rem 0;
-        animation: pulse 2s infinite;
-        background: rgba(255,255,255,0.9) !important;
-        padding: 1rem;
-        border-radius: 15px;
-        border: 3px solid #333;
-    }
-    
-    .type-badge {
-        display: inline-block;
-        padding: 0.4rem 1rem;
-        margin: 0.2rem;
-        border-radius: 25px;
-        font-family: 'Arial', 'Helvetica', sans-serif;
-        font-weight: bold;
-        font-size: 0.8rem;
-        text-transform: uppercase;
-        color: white !important;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.8);
-        border: 2px solid #fff;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.3);
-    }
-    
-    /* Pokemon type colors with !important for production */
-    .type-normal { background: linear-gradient(45deg, #A8A878, #BCBC7A) !important; }
-    .type-fire { background: linear-gradient(45deg, #F08030, #F5AC78) !important; }
-    .type-water { background: linear-gradient(45deg, #6890F0, #9DB7F5) !important; }
-    .type-electric { background: linear-gradient(45deg, #F8D030, #FAE078) !important; color: #333 !important; }
-    .type-grass { background: linear-gradient(45deg, #78C850, #A7DB8D) !important; }
-    .type-ice { background: linear-gradient(45deg, #98D8D8, #BCE6E6) !important; color: #333 !important; }
-    .type-fighting { background: linear-gradient(45deg, #C03028, #D67873) !important; }
-    .type-poison { background: linear-gradient(45deg, #A040A0, #C183C1) !important; }
-    .type-ground { background: linear-gradient(45deg, #E0C068, #EBD69D) !important; color: #333 !important; }
-    .type-flying { background: linear-gradient(45deg, #A890F0, #C6B7F5) !important; }
-    .type-psychic { background: linear-gradient(45deg, #F85888, #FA92B2) !important; }
-    .type-bug { background: linear-gradient(45deg, #A8B820, #C6D16E) !important; }
-    .type-rock { background: linear-gradient(45deg, #B8A038, #D1C17D) !important; }
-    .type-ghost { background: linear-gradient(45deg, #705898, #A292BC) !important; }
-    .type-dragon { background: linear-gradient(45deg, #7038F8, #A27DFA) !important; }
-    .type-dark { background: linear-gradient(45deg, #705848, #A29288) !important; }
-    .type-steel { background: linear-gradient(45deg, #B8B8D0, #D1D1E0) !important; color: #333 !important; }
-    .type-fairy { background: linear-gradient(45deg, #EE99AC, #F4BDC9) !important; color: #333 !important; }
-    
-    .stat-bar-container {
-        background: rgba(255,255,255,0.9);
-        border-radius: 10px;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        border: 2px solid #333;
-    }
-    
-    .stat-bar {
-        background: #ddd;
-        border-radius: 10px;
-        overflow: hidden;
-        margin: 0.3rem 0;
-        height: 20px;
-        position: relative;
-        border: 1px solid #333;
-    }
-    
-    .stat-fill {
-        height: 100%;
-        border-radius: 8px;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        color: white;
-        font-family: 'Arial', 'Helvetica', sans-serif;
-        font-weight: bold;
-        font-size: 0.8rem;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.7);
-        transition: width 1s ease-in-out;
-    }
-    
-    .hp-bar { background: linear-gradient(90deg, #e74c3c, #c0392b) !important; }
-    .attack-bar { background: linear-gradient(90deg, #e67e22, #d35400) !important; }
-    .defense-bar { background: linear-gradient(90deg, #3498db, #2980b9) !important; }
-    .sp-attack-bar { background: linear-gradient(90deg, #9b59b6, #8e44ad) !important; }
-    .sp-defense-bar { background: linear-gradient(90deg, #1abc9c, #16a085) !important; }
-    .speed-bar { background: linear-gradient(90deg, #f39c12, #e67e22) !important; }
-    
-    .stButton > button {
-        background: linear-gradient(45deg, #e74c3c, #c0392b) !important;
-        color: white !important;
-        border: 3px solid #fff !important;
-        border-radius: 25px !important;
-        padding: 0.75rem 2rem !important;
-        font-family: 'Arial', 'Helvetica', sans-serif !important;
-        font-weight: bold !important;
-        font-size: 1rem !important;
-        transition: all 0.3s ease !important;
-        box-shadow: 0 6px 20px rgba(231, 76, 60, 0.4) !important;
-        text-transform: uppercase !important;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 8px 25px rgba(231, 76, 60, 0.6);
-        background: linear-gradient(45deg, #c0392b, #a93226);
-    }
-    
-    .sidebar .stSelectbox > div > div {
-        background: linear-gradient(145deg, #fff, #f8f9fa);
-        border: 2px solid #333;
-        border-radius: 10px;
-    }
-    
-    .battle-turn {
-        background: linear-gradient(135deg, #2c3e50, #34495e);
-        color: white;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        border-radius: 10px;
-        border-left: 4px solid #3498db;
-        font-family: 'Arial', 'Helvetica', sans-serif;
-    }
-    
-    .damage-text { color: #e74c3c; font-weight: bold; animation: shake 0.5s; }
-    .heal-text { color: #2ecc71; font-weight: bold; animation: pulse 0.5s; }
-    .status-text { color: #f39c12; font-weight: bold; }
-    .critical-text { color: #e67e22; font-weight: bold; animation: flash 0.5s; }
-    
-    @keyframes shake {
-        0%, 100% { transform: translateX(0); }
-        25% { transform: translateX(-5px); }
-        75% { transform: translateX(5px); }
-    }
-    
-    @keyframes flash {
-        0%, 100% { opacity: 1; }
-        50% { opacity: 0.3; }
-    }
-    
-    .pokemon-sprite {
-        filter: drop-shadow(0 8px 16px rgba(0,0,0,0.3));
-        transition: transform 0.3s ease;
-    }
-    
-    .pokemon-sprite:hover {
-        transform: scale(1.1) rotate(5deg);
-    }
-    
-    .tab-header {
-        font-family: 'Courier New', 'Monaco', monospace;
-        font-size: 1.2rem;
-        font-weight: bold;
-        color: #2c3e50 !important;
-        text-align: center;
-        margin: 1rem 0;
-        padding: 1rem;
-        background: rgba(255,255,255,0.9) !important;
-        border-radius: 15px;
-        border: 3px solid #333;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data
+def load_css() -> str:
+    """Read the app stylesheet once; it is static for the lifetime of the process."""
+    return (Path(__file__).parent / "assets" / "pokemon.css").read_text(encoding="utf-8")
+
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # Initialize session state
-if 'battle_log' not in st.session_state:
-    st.session_state.battle_log = ""
+# The current battle log is kept as rendered HTML lines, capped so a runaway log stays bounded
+LOG_LINE_LIMIT = 1000
+
+if 'battle_log_html' not in st.session_state:
+    st.session_state.battle_log_html = deque(maxlen=LOG_LINE_LIMIT)
 if 'pokemon_data' not in st.session_state:
     st.session_state.pokemon_data = {}
+# Only the most recent battles are kept; older logs are dropped as new ones arrive
+HISTORY_LIMIT = 20
+HISTORY_PAGE_SIZE = 5
+
 if 'battle_history' not in st.session_state:
-    st.session_state.battle_history = []
+    st.session_state.battle_history = deque(maxlen=HISTORY_LIMIT)
+if 'battle_count' not in st.session_state:
+    st.session_state.battle_count = 0
 
 # Initialize resources
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """One long-lived event loop so the HTTP client keeps its connections across reruns."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
 @st.cache_resource
 def get_pokemon_resource():
-    return PokemonResource()
+    resource = PokemonResource()
+    loop = get_event_loop()
+    # Close the HTTP client on the loop that owns it when the server process exits
+    atexit.register(lambda: asyncio.run_coroutine_threadsafe(resource.aclose(), loop).result(timeout=5))
+    return resource
 
 @st.cache_resource
 def get_battle_tool():
-    return BattleTool()
+    # Reuse the UI's resource so battles share its connection pool and cache
+    return BattleTool(get_pokemon_resource())
 
 pokemon_resource = get_pokemon_resource()
 battle_tool = get_battle_tool()
 
+POPULAR_POKEMON = [
+    "pikachu", "charizard", "blastoise", "venusaur", "mewtwo", "mew", "gyarados", "dragonite",
+    "alakazam", "machamp", "lucario", "garchomp", "rayquaza", "dialga", "palkia"
+]
+
+# Battle log line classification. Alternatives are tried in order from the
+# start of the line, so earlier categories win, as in an if/elif chain.
+# Each template carries its own line break so the parts can be joined directly.
+_LOG_LINE_PATTERN = re.compile(
+    r"(?P<header>===)"
+    r"|(?! )(?=.* vs )(?P<versus>)"
+    r"|(?=.* used )(?P<move>)"
+    r"|(?=.* took )(?=.* damage)(?P<damage>)"
+    r"|(?=.* fainted!)(?P<faint>)"
+    r"|(?=.* wins!)(?P<win>)"
+)
+
+_LOG_LINE_TEMPLATES = {
+    'header': '<div style="color: #f1c40f; font-weight: bold; text-align: center; margin: 1rem 0;">🏆 {line} 🏆</div><br>',
+    'versus': '<div style="color: #e74c3c; font-weight: bold; text-align: center; margin: 1rem 0;">⚔️ {line} ⚔️</div><br>',
+    'move': '<div class="status-text">💫 {line}</div><br>',
+    'damage': '<div class="damage-text">💥 {line}</div><br>',
+    'faint': '<div style="color: #e74c3c; font-weight: bold;">💀 {line}</div><br>',
+    'win': '<div style="color: #2ecc71; font-weight: bold; font-size: 1.2em; text-align: center;">🎉 {line} 🎉</div><br>',
+    None: '<div style="color: #ecf0f1;">{line}</div><br>',
+}
+
 # Helper functions
-async def fetch_pokemon_data(pokemon_name: str) -> Optional[Dict[str, Any]]:
-    """Fetch Pokémon data asynchronously."""
-    try:
-        return await pokemon_resource.get_pokemon_stats(pokemon_name.lower())
-    except Exception as e:
-        st.error(f"Error fetching {pokemon_name}: {str(e)}")
-        return None
+def run_async(coro):
+    """Run a coroutine on the shared event loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+# Gradient stops for each stat bar, left to right
+STAT_BAR_GRADIENTS = {
+    'hp': ('#e74c3c', '#c0392b'), 'attack': ('#e67e22', '#d35400'), 'defense': ('#3498db', '#2980b9'),
+    'special_attack': ('#9b59b6', '#8e44ad'), 'special_defense': ('#1abc9c', '#16a085'), 'speed': ('#f39c12', '#e67e22')
+}
+STAT_ROW_HEIGHT = 44
+
+def _stats_svg(stats: Dict[str, int]) -> str:
+    """Pre-render all stat bars as one inline SVG for the stats card."""
+    defs = "".join(
+        f'<linearGradient id="stat-{stat_name}"><stop offset="0" stop-color="{start}"/><stop offset="1" stop-color="{end}"/></linearGradient>'
+        for stat_name, (start, end) in STAT_BAR_GRADIENTS.items()
+    )
+    rows = []
+    for i, (stat_name, value) in enumerate(stats.items()):
+        y = i * STAT_ROW_HEIGHT
+        fill = f'url(#stat-{stat_name})' if stat_name in STAT_BAR_GRADIENTS else 'url(#stat-hp)'
+        rows.append(
+            f'<text x="0" y="{y + 14}">{stat_name.replace("_", " ").title()}:</text>'
+            f'<text x="100%" y="{y + 14}" text-anchor="end">{value}</text>'
+            f'<rect y="{y + 20}" width="100%" height="20" rx="10" fill="#ddd" stroke="#333"/>'
+            f'<rect y="{y + 20}" width="{min(value / 2, 100)}%" height="20" rx="8" fill="{fill}"/>'
+        )
+    return (
+        f'<svg width="100%" height="{len(rows) * STAT_ROW_HEIGHT}" fill="currentColor" '
+        'style="font-family: \'Nunito\', sans-serif; font-weight: bold; font-size: 14px; overflow: visible;">'
+        f'<defs>{defs}</defs>{"".join(rows)}</svg>'
+    )
+
+async def _fetch_all(pokemon_names) -> List[Any]:
+    """Fetch several Pokémon concurrently, returning exceptions in place of failed results."""
+    return await asyncio.gather(
+        *(pokemon_resource.get_pokemon_stats(name) for name in pokemon_names),
+        return_exceptions=True
+    )
+
+class SelectionLoadError(Exception):
+    """Some selected Pokémon failed to load; carries the ones that did and the failures by name."""
+    
+    def __init__(self, loaded: Dict[str, Dict[str, Any]], failures: Dict[str, Exception]):
+        super().__init__(", ".join(f"{name}: {error}" for name, error in failures.items()))
+        self.loaded = loaded
+        self.failures = failures
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _cached_selection_stats(pokemon_names: Tuple[str, ...]) -> Dict[str, Dict[str, Any]]:
+    """Fetch the selected Pokémon concurrently, once per selection; failures raise so they are not cached."""
+    results = run_async(_fetch_all(pokemon_names))
+    # Copy rather than annotate in place: the resource's cache holds the same dicts
+    loaded = {
+        name: {**result, 'stats_svg': _stats_svg(result['stats'])}
+        for name, result in zip(pokemon_names, results) if not isinstance(result, Exception)
+    }
+    failures = {name: result for name, result in zip(pokemon_names, results) if isinstance(result, Exception)}
+    if failures:
+        raise SelectionLoadError(loaded, failures)
+    return loaded
+
+@st.cache_resource
+def warm_popular_pokemon():
+    """Start loading the Popular Picks roster in the background, once per process."""
+    # Deliberately not awaited, and low priority so users' own lookups are not stuck behind it
+    return asyncio.run_coroutine_threadsafe(pokemon_resource.warm(POPULAR_POKEMON), get_event_loop())
+
+warm_popular_pokemon()
 
 def display_pokemon_stats(pokemon_data: Dict[str, Any], col):
     """Display Pokémon stats in a Pokemon-themed card."""
     with col:
         if pokemon_data:
-            #st.markdown('<div class="pokemon-card">', unsafe_allow_html=True)
-            
-            # Pokemon name
-            st.markdown(f'<div class="pokemon-name">{pokemon_data["name"].title()}</div>', unsafe_allow_html=True)
-            
-            
-            # Display types
-            types_html = ""
-            for pokemon_type in pokemon_data['types']:
-                type_name = pokemon_type['name'].lower()
-                types_html += f'<span class="type-badge type-{type_name}">{type_name}</span>'
-            st.markdown(f'<div style="text-align: center; margin: 1rem 0;">{types_html}</div>', unsafe_allow_html=True)
+            # Build the whole card and send it as a single markdown element
+            html_parts = [f'<div class="pokemon-name">{pokemon_data["name"].title()}</div>']
             
-            # Display stats
-            # Load retro font
-            st.markdown(
-                """
-                <style>
-                @import url('https://fonts.googleapis.com/css2?family=Press+Start+2P&display=swap');
-
-                .stat-bar-container {
-                    font-family: 'Press Start 2P', cursive;
-                    font-size: 16px;
-                    color: black;
-                    text-align: center;
-                    padding: 8px;
-                }
-                </style>
-                """,
-                unsafe_allow_html=True
+            # Types
+            types_html = "".join(
+                f'<span class="type-badge type-{t["name"].lower()}">{t["name"].lower()}</span>'
+                for t in pokemon_data['types']
             )
-
-            # Apply it to your text
-            st.markdown(
-                '<div class="stat-bar-container">Base Stats</div>',
-                unsafe_allow_html=True
-            )
-            
-            stats = pokemon_data['stats']
-            stat_colors = {
-                'hp': 'hp-bar', 'attack': 'attack-bar', 'defense': 'defense-bar',
-                'special_attack': 'sp-attack-bar', 'special_defense': 'sp-defense-bar', 'speed': 'speed-bar'
-            }
+            html_parts.append(f'<div style="text-align: center; margin: 1rem 0;">{types_html}</div>')
             
-            for stat_name, value in stats.items():
-                percentage = min(value / 200 * 100, 100)
-                color_class = stat_colors.get(stat_name, 'hp-bar')
-                display_name = stat_name.replace('_', ' ').title()
-                
-                st.markdown(f"""
-                <div style="margin: 0.3rem 0;">
-                    <div style="display: flex; justify-content: space-between; font-family: 'Nunito', sans-serif; font-weight: bold;">
-                        <span>{display_name}:</span>
-                        <span>{value}</span>
-                    </div>
-                    <div class="stat-bar">
-                        <div class="stat-fill {color_class}" style="width: {percentage}%;">
-                        </div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            # Stats
+            html_parts.append('<div class="stat-bar-container">Base Stats</div>')
+            html_parts.append(pokemon_data['stats_svg'])
             
-            st.markdown('</div></div>', unsafe_allow_html=True)
+            st.markdown("".join(html_parts), unsafe_allow_html=True)
 
-def format_battle_log(battle_log: str) -> str:
-    """Format battle log with Pokemon-themed HTML styling."""
-    lines = battle_log.split('\n')
-    formatted_lines = []
-    
-    for line in lines:
-        if not line.strip():
-            continue
-            
-        if line.startswith('==='):
-            formatted_lines.append(f'<div style="color: #f1c40f; font-weight: bold; text-align: center; margin: 1rem 0;">🏆 {line} 🏆</div>')
-        elif ' vs ' in line and not line.startswith(' '):
-            formatted_lines.append(f'<div style="color: #e74c3c; font-weight: bold; text-align: center; margin: 1rem 0;">⚔️ {line} ⚔️</div>')
-        elif ' used ' in line:
-            formatted_lines.append(f'<div class="status-text">💫 {line}</div>')
-        elif ' took ' in line and ' damage' in line:
-            formatted_lines.append(f'<div class="damage-text">💥 {line}</div>')
-        elif ' fainted!' in line:
-            formatted_lines.append(f'<div style="color: #e74c3c; font-weight: bold;">💀 {line}</div>')
-        elif ' wins!' in line:
-            formatted_lines.append(f'<div style="color: #2ecc71; font-weight: bold; font-size: 1.2em; text-align: center;">🎉 {line} 🎉</div>')
-        else:
-            formatted_lines.append(f'<div style="color: #ecf0f1;">{line}</div>')
-    
-    return '<br>'.join(formatted_lines)
+def _classify_log_line(line: str) -> str:
+    """Render one battle log line with the template for its category."""
+    match = _LOG_LINE_PATTERN.match(line)
+    return _LOG_LINE_TEMPLATES[match.lastgroup if match else None].format_map({'line': line})
+
+def format_battle_log(battle_log: str):
+    """Yield each non-empty battle log line with Pokemon-themed HTML styling."""
+    return (_classify_log_line(line) for line in battle_log.splitlines() if line.strip())
 
 def run_async_battle(pokemon1_name: str, pokemon2_name: str, moves1: List[str] = None, moves2: List[str] = None):
     """Run battle simulation asynchronously."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(
-            battle_tool.simulate_battle(pokemon1_name, pokemon2_name, moves1, moves2)
-        )
-    finally:
-        loop.close()
+    return run_async(battle_tool.simulate_battle(pokemon1_name, pokemon2_name, moves1, moves2))
 
 # Main UI
 st.markdown('<h1 class="main-header">⚔️ POKÉMON BATTLE SIMULATOR ⚔️</h1>', unsafe_allow_html=True)
@@ -487,10 +225,14 @@ with st.sidebar:
         # Show some examples
         st.markdown("💡 **Examples:** *lucario, garchomp, rayquaza, dialga, palkia, giratina, arceus, reshiram, zekrom, kyurem*")
     else:
-        pokemon_options = ["pikachu", "charizard", "blastoise", "venusaur", "mewtwo", "mew", "gyarados", "dragonite", "alakazam", "machamp", "lucario", "garchomp", "rayquaza", "dialga", "palkia"]
-        
-        pokemon1_name = st.selectbox("🔴 Player 1 Pokémon", options=pokemon_options, index=0)
-        pokemon2_name = st.selectbox("🔵 Player 2 Pokémon", options=pokemon_options, index=1)
+        pokemon1_name = st.selectbox("🔴 Player 1 Pokémon", options=POPULAR_POKEMON, index=0)
+        pokemon2_name = st.selectbox("🔵 Player 2 Pokémon", options=POPULAR_POKEMON, index=1)
+    
+    # Normalize the selections once per rerun and reuse the bindings below
+    p1 = pokemon1_name.strip().lower()
+    p2 = pokemon2_name.strip().lower()
+    p1_title, p1_upper = p1.title(), p1.upper()
+    p2_title, p2_upper = p2.title(), p2.upper()
     
     # Quick battle button
     battle_button = st.button("🥊 START EPIC BATTLE!", type="primary", use_container_width=True)
@@ -498,6 +240,27 @@ with st.sidebar:
     st.markdown("---")
     
 
+def clear_history():
+    st.session_state.battle_history.clear()
+
+@st.fragment
+def history_view():
+    """Paginated battle history; paging and clearing rerun only this fragment."""
+    history = st.session_state.battle_history
+    if not history:
+        st.info("🎯 No battles recorded yet! Start your first epic battle!")
+        return
+    
+    pages = (len(history) + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+    page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1) if pages > 1 else 1
+    newest_first = list(reversed(history))
+    start = (page - 1) * HISTORY_PAGE_SIZE
+    for battle in newest_first[start:start + HISTORY_PAGE_SIZE]:
+        with st.expander(f"⚔️ Battle {battle['number']}: {battle['pokemon1']} vs {battle['pokemon2']} - {battle['timestamp']}"):
+            st.code(battle['result'])
+    
+    st.button("🗑️ Clear All History", use_container_width=True, on_click=clear_history)
+
 # Main content
 tab1, tab2, tab3 = st.tabs(["🏟️ **BATTLE ARENA**", "📊 **POKÉMON STATS**", "📜 **BATTLE HISTORY**"])
 
@@ -509,36 +272,40 @@ with tab1:
     col1, col2, col3 = st.columns([2, 1, 2])
     
     with col1:
-        st.markdown(f'<div class="pokemon-name" style="color: #e74c3c;">🔴 {pokemon1_name.upper()}</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="pokemon-name" style="color: #e74c3c;">🔴 {p1_upper}</div>', unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="vs-container">VS</div>', unsafe_allow_html=True)
     
     with col3:
-        st.markdown(f'<div class="pokemon-name" style="color: #3498db;">🔵 {pokemon2_name.upper()}</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="pokemon-name" style="color: #3498db;">🔵 {p2_upper}</div>', unsafe_allow_html=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Battle execution
     if battle_button:
         with st.spinner("⚔️ Epic battle in progress..."):
-            battle_result = run_async_battle(pokemon1_name, pokemon2_name)
-            st.session_state.battle_log = battle_result
+            battle_result = run_async_battle(p1, p2)
+            # Format the new log once; reruns only join the stored lines
+            st.session_state.battle_log_html.clear()
+            st.session_state.battle_log_html.extend(format_battle_log(battle_result))
             
             # Add to history
+            st.session_state.battle_count += 1
             st.session_state.battle_history.append({
+                "number": st.session_state.battle_count,
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "pokemon1": pokemon1_name.title(),
-                "pokemon2": pokemon2_name.title(),
+                "pokemon1": p1_title,
+                "pokemon2": p2_title,
                 "result": battle_result
             })
             
             st.success("🎉 Battle completed!")
     
     # Battle log display
-    if st.session_state.battle_log:
+    if st.session_state.battle_log_html:
         st.markdown("---")
-        formatted_log = format_battle_log(st.session_state.battle_log)
+        formatted_log = ''.join(st.session_state.battle_log_html)
         st.markdown(f'<div class="battle-log">{formatted_log}</div>', unsafe_allow_html=True)
 
 with tab2:
@@ -546,49 +313,25 @@ with tab2:
     
     col1, col2 = st.columns(2)
     
-    # Display Pokemon stats
-    if pokemon1_name:
-        with st.spinner(f"Loading {pokemon1_name}..."):
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                pokemon1_data = loop.run_until_complete(fetch_pokemon_data(pokemon1_name))
-                if pokemon1_data:
-                    display_pokemon_stats(pokemon1_data, col1)
-            except Exception as e:
-                with col1:
-                    st.error(f"Could not load {pokemon1_name}")
-            finally:
-                loop.close()
-    
-    if pokemon2_name:
-        with st.spinner(f"Loading {pokemon2_name}..."):
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                pokemon2_data = loop.run_until_complete(fetch_pokemon_data(pokemon2_name))
-                if pokemon2_data:
-                    display_pokemon_stats(pokemon2_data, col2)
-            except Exception as e:
-                with col2:
-                    st.error(f"Could not load {pokemon2_name}")
-            finally:
-                loop.close()
+    # Display Pokemon stats for both selections, loaded together and cached per selection
+    selected = [(name, title, col) for name, title, col in ((p1, p1_title, col1), (p2, p2_title, col2)) if name]
+    try:
+        with st.spinner("Loading Pokémon..."):
+            loaded, failures = _cached_selection_stats(tuple(name for name, _, _ in selected)), {}
+    except SelectionLoadError as e:
+        loaded, failures = e.loaded, e.failures
+    
+    for name, title, col in selected:
+        if name in loaded:
+            display_pokemon_stats(loaded[name], col)
+        else:
+            with col:
+                st.error(f"Could not load {title}: {str(failures[name])}")
 
 with tab3:
     st.markdown('<div class="tab-header">📜 BATTLE HISTORY</div>', unsafe_allow_html=True)
     
-    if st.session_state.battle_history:
-        for i, battle in enumerate(reversed(st.session_state.battle_history)):
-            with st.expander(f"⚔️ Battle {len(st.session_state.battle_history) - i}: {battle['pokemon1']} vs {battle['pokemon2']} - {battle['timestamp']}"):
-                st.code(battle['result'])
-        
-        if st.button("🗑️ Clear All History", use_container_width=True):
-            st.session_state.battle_history = []
-            st.success("History cleared!")
-            st.rerun()
-    else:
-        st.info("🎯 No battles recorded yet! Start your first epic battle!")
+    history_view()
 
 # Footer
 st.markdown("---")
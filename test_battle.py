@@ -3,67 +3,110 @@
 Test the Pokemon battle system directly
 """
 
-from tools.pokemon_battle import Pokemon, Move, BattleCalculator, TypeEffectiveness
+import numpy as np
+import pytest
 
-def test_battle_system():
-    print("=== Testing Pokemon Battle System ===\n")
-    
-    # Test 1: Create moves
-    print("1. Testing Move creation...")
-    tackle = Move("tackle", 40, 100, 35, "normal", "physical")
-    thunderbolt = Move("thunderbolt", 90, 100, 15, "electric", "special")
-    print(f"✅ Created moves: {tackle.name} (power: {tackle.power}), {thunderbolt.name} (power: {thunderbolt.power})")
-    
-    # Test 2: Create Pokemon
-    print("\n2. Testing Pokemon creation...")
-    pikachu_stats = {'hp': 35, 'attack': 55, 'defense': 40, 'special_attack': 50, 'special_defense': 50, 'speed': 90}
-    charizard_stats = {'hp': 78, 'attack': 84, 'defense': 78, 'special_attack': 109, 'special_defense': 85, 'speed': 100}
-    
-    pikachu = Pokemon("pikachu", pikachu_stats, ["electric"], [tackle, thunderbolt])
-    charizard = Pokemon("charizard", charizard_stats, ["fire", "flying"], [tackle])
-    
-    print(f"✅ Pikachu: HP {pikachu.current_hp}/{pikachu.max_hp}, Speed {pikachu.speed}")
-    print(f"✅ Charizard: HP {charizard.current_hp}/{charizard.max_hp}, Speed {charizard.speed}")
-    
-    # Test 3: Type effectiveness
-    print("\n3. Testing type effectiveness...")
-    water_vs_fire = TypeEffectiveness.get_multiplier("water", ["fire"])
-    electric_vs_flying = TypeEffectiveness.get_multiplier("electric", ["flying"])
-    electric_vs_fire = TypeEffectiveness.get_multiplier("electric", ["fire"])
+from tools.pokemon_battle import (
+    Pokemon, Move, BattleCalculator, TypeEffectiveness, PokemonType, TYPE_ID, EFFECTIVENESS_MATRIX,
+)
+
+PIKACHU_STATS = {'hp': 35, 'attack': 55, 'defense': 40, 'special_attack': 50, 'special_defense': 50, 'speed': 90}
+CHARIZARD_STATS = {'hp': 78, 'attack': 84, 'defense': 78, 'special_attack': 109, 'special_defense': 85, 'speed': 100}
+
+# Dense 18x18 attacker-by-defender view of the type chart, built once at import
+TYPES = [t.value for t in PokemonType]
+TYPE_INDEX = {name: i for i, name in enumerate(TYPES)}
+EFF_TABLE = np.array(
+    [[TypeEffectiveness.EFFECTIVENESS.get(atk, {}).get(dfn, 1.0) for dfn in TYPES] for atk in TYPES],
+    dtype=np.float32,
+)
+
+
+@pytest.fixture(scope="module")
+def tackle():
+    return Move("tackle", 40, 100, 35, "normal", "physical")
+
+
+@pytest.fixture(scope="module")
+def thunderbolt():
+    return Move("thunderbolt", 90, 100, 15, "electric", "special")
+
+
+@pytest.fixture(scope="module")
+def pikachu(tackle, thunderbolt):
+    return Pokemon("pikachu", PIKACHU_STATS, ["electric"], [tackle, thunderbolt])
+
+
+@pytest.fixture(scope="module")
+def charizard(tackle):
+    return Pokemon("charizard", CHARIZARD_STATS, ["fire", "flying"], [tackle])
+
+
+def test_move_creation(tackle, thunderbolt):
+    assert (tackle.name, tackle.power) == ("tackle", 40)
+    assert (thunderbolt.name, thunderbolt.power) == ("thunderbolt", 90)
+
+
+def test_pokemon_creation(pikachu, charizard):
+    assert pikachu.current_hp == pikachu.max_hp == 110
+    assert pikachu.type_ids == (TYPE_ID["electric"],)
+    assert pikachu.speed == 110
+    assert charizard.current_hp == charizard.max_hp == 153
+    assert charizard.speed == 120
+
+
+def test_type_effectiveness():
+    assert TypeEffectiveness.get_multiplier("water", ["fire"]) == 2.0
+    assert TypeEffectiveness.get_multiplier("electric", ["flying"]) == 2.0
+    assert TypeEffectiveness.get_multiplier("electric", ["fire"]) == 1.0
+
+
+def test_type_chart_matrix_matches_lookup():
+    # Every attacker against every single- and dual-type defender in one indexed product
+    def_idx = np.array([(d1, d2) for d1 in range(len(TYPES)) for d2 in range(len(TYPES))])
+    mults = EFF_TABLE[:, def_idx].prod(axis=-1)
     
-    print(f"✅ Water vs Fire: {water_vs_fire}x (should be 2.0)")
-    print(f"✅ Electric vs Flying: {electric_vs_flying}x (should be 2.0)")
-    print(f"✅ Electric vs Fire: {electric_vs_fire}x (should be 1.0)")
+    # The precomputed production matrix must agree with the chart built here from the dict
+    assert EFFECTIVENESS_MATRIX.dtype == np.float32
+    np.testing.assert_array_equal(EFFECTIVENESS_MATRIX, EFF_TABLE)
+    assert TYPE_ID == TYPE_INDEX
+    assert mults.shape == (len(TYPES), len(TYPES) ** 2)
+    assert EFF_TABLE[TYPE_INDEX["water"], TYPE_INDEX["fire"]] == 2.0
+    assert EFF_TABLE[TYPE_INDEX["electric"], TYPE_INDEX["flying"]] == 2.0
+    assert EFF_TABLE[TYPE_INDEX["electric"], TYPE_INDEX["ground"]] == 0.0
     
-    # Test 4: Damage calculation
-    print("\n4. Testing damage calculation...")
+    # Mono-type defenders are the (d, d) pairs; the product would square them
+    mono = def_idx[:, 0] == def_idx[:, 1]
+    mults[:, mono] = EFF_TABLE[:, def_idx[mono, 0]]
+    expected = np.array([
+        [TypeEffectiveness.get_multiplier(atk, sorted({TYPES[d1], TYPES[d2]})) for d1, d2 in def_idx]
+        for atk in TYPES
+    ], dtype=np.float32)
+    np.testing.assert_allclose(mults, expected)
+
+
+def test_damage_calculation(pikachu, charizard):
+    # Use Pikachu's own copy of the move, which carries its STAB
+    thunderbolt = pikachu.moves[1]
     damage, is_critical, type_eff = BattleCalculator.calculate_damage(pikachu, charizard, thunderbolt)
-    print(f"✅ Pikachu's Thunderbolt vs Charizard:")
-    print(f"   Damage: {damage}")
-    print(f"   Critical: {is_critical}")
-    print(f"   Type effectiveness: {type_eff}x")
-    
-    # Test 5: Battle simulation
-    print("\n5. Testing battle mechanics...")
-    original_hp = charizard.current_hp
-    actual_damage = charizard.take_damage(damage)
-    print(f"✅ Charizard took {actual_damage} damage")
-    print(f"   HP: {original_hp} → {charizard.current_hp}")
-    
-    # Test 6: Speed-based turn order
-    print("\n6. Testing turn order...")
-    if pikachu.speed > charizard.speed:
-        print(f"✅ Pikachu (speed {pikachu.speed}) goes first")
-    else:
-        print(f"✅ Charizard (speed {charizard.speed}) goes first")
-    
-    print("\n🎉 All battle system tests passed!")
-    return True
+    assert damage >= 1
+    assert is_critical in (True, False)
+    assert type_eff == 2.0
+
+
+def test_take_damage(pikachu, charizard):
+    # Work on a fresh Charizard so the shared fixture keeps full HP
+    target = Pokemon("charizard", CHARIZARD_STATS, ["fire", "flying"], [])
+    damage, _, _ = BattleCalculator.calculate_damage(pikachu, target, pikachu.moves[1])
+    actual_damage = target.take_damage(damage)
+    assert actual_damage == min(damage, target.max_hp)
+    assert target.current_hp == target.max_hp - actual_damage
+
+
+def test_turn_order(pikachu, charizard):
+    # Charizard's higher base speed means it moves first
+    assert charizard.speed > pikachu.speed
+
 
 if __name__ == "__main__":
-    try:
-        test_battle_system()
-    except Exception as e:
-        print(f"❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,25 @@
+"""
+Shared test fixtures
+"""
+
+import httpx
+import pytest
+import pytest_asyncio
+from server import app
+from tools.pokemon_battle import RNGPool
+
+# Session fixtures live here so pytest-xdist builds them once per worker process
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    # One in-process ASGI client per session; no test mutates app state
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+@pytest.fixture
+def seeded_rng():
+    # RNGPool is process-wide: seed it for this test only and put the previous stream back after
+    saved = RNGPool.rng, RNGPool.uniforms, RNGPool.idx
+    RNGPool.seed(0)
+    yield RNGPool
+    RNGPool.rng, RNGPool.uniforms, RNGPool.idx = saved
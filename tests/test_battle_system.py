@@ -2,8 +2,33 @@
 Tests for Battle System Components
 """
 
+import os
 import pytest
-from tools.pokemon_battle import Pokemon, Move, BattleCalculator, TypeEffectiveness, StatusEffect
+from types import MappingProxyType
+from tools.batch_battle import BatchBattleState, simulate_battles_batch
+from tools.pokemon_battle import (
+    Pokemon, Move, BattleCalculator, TypeEffectiveness, StatusEffect, RNGPool, TYPE_CHART, MOVE_STATUS,
+    _base_damage, _damage_kernel,
+)
+
+# Read-only templates: Pokemon copies its stats into attributes and these tests never use up PP
+_STATS_100 = MappingProxyType({
+    'hp': 100, 'attack': 100, 'defense': 100,
+    'special_attack': 100, 'special_defense': 100, 'speed': 100
+})
+
+# Max HP of a level-50 Pokémon with _STATS_100
+_HP_100 = int(((2 * 100 + 31) * 50) / 100) + 50 + 10
+
+@pytest.fixture(scope="module")
+def default_moves():
+    return (Move("tackle", 40, 100, 35, "normal", "physical"),)
+
+@pytest.fixture
+def make_pokemon(default_moves):
+    def make(name="test", moves=default_moves):
+        return Pokemon(name, _STATS_100, ["normal"], list(moves))
+    return make
 
 class TestMove:
     
@@ -27,6 +52,10 @@ class TestMove:
         
         assert move.current_pp == 0
         assert move.can_use() is False
+    
+    def test_move_status_effect(self):
+        assert Move("thunderbolt", 90, 100, 15, "electric", "special").status_effect == (StatusEffect.PARALYSIS, 0.3)
+        assert Move("tackle", 40, 100, 35, "normal", "physical").status_effect is None
 
 class TestPokemon:
     
@@ -46,51 +75,40 @@ class TestPokemon:
         assert pokemon.current_hp == pokemon.max_hp
         assert pokemon.is_fainted is False
     
-    def test_hp_calculation(self):
-        stats = {'hp': 100, 'attack': 100, 'defense': 100, 
-                'special_attack': 100, 'special_defense': 100, 'speed': 100}
-        moves = [Move("tackle", 40, 100, 35, "normal", "physical")]
-        
-        pokemon = Pokemon("test", stats, ["normal"], moves, level=50)
+    def test_hp_calculation(self, default_moves):
+        pokemon = Pokemon("test", _STATS_100, ["normal"], list(default_moves), level=50)
         
         # HP should be calculated using the formula
-        expected_hp = int(((2 * 100 + 31) * 50) / 100) + 50 + 10
-        assert pokemon.max_hp == expected_hp
+        assert pokemon.max_hp == _HP_100
     
-    def test_take_damage(self):
-        stats = {'hp': 100, 'attack': 100, 'defense': 100, 
-                'special_attack': 100, 'special_defense': 100, 'speed': 100}
-        moves = [Move("tackle", 40, 100, 35, "normal", "physical")]
-        
-        pokemon = Pokemon("test", stats, ["normal"], moves)
-        initial_hp = pokemon.current_hp
-        
-        damage_taken = pokemon.take_damage(50)
-        
-        assert damage_taken == 50
-        assert pokemon.current_hp == initial_hp - 50
-        assert pokemon.is_fainted is False
+    def test_pokemon_has_no_instance_dict(self, make_pokemon):
+        assert not hasattr(make_pokemon(), '__dict__')
     
-    def test_fainting(self):
-        stats = {'hp': 100, 'attack': 100, 'defense': 100, 
-                'special_attack': 100, 'special_defense': 100, 'speed': 100}
-        moves = [Move("tackle", 40, 100, 35, "normal", "physical")]
+    def test_moves_get_owner_stab(self):
+        ember = Move("ember", 40, 100, 25, "fire", "special")
+        charmander = Pokemon("charmander", _STATS_100, ["fire"], [ember])
+        squirtle = Pokemon("squirtle", _STATS_100, ["water"], [ember])
         
-        pokemon = Pokemon("test", stats, ["normal"], moves)
+        # Sharing a Move between Pokémon must not leak one owner's STAB into the other
+        assert charmander.moves[0].stab_halves == 3
+        assert squirtle.moves[0].stab_halves == 2
+    
+    @pytest.mark.parametrize("damage,expected_taken,fainted", [
+        (50, 50, False),                   # partial damage
+        (_HP_100, _HP_100, True),          # exactly lethal
+        (_HP_100 + 50, _HP_100, True),     # overkill only takes the remaining HP
+    ])
+    def test_take_damage(self, make_pokemon, damage, expected_taken, fainted):
+        pokemon = make_pokemon()
         
-        # Deal more damage than current HP
-        damage_taken = pokemon.take_damage(pokemon.current_hp + 50)
+        damage_taken = pokemon.take_damage(damage)
         
-        assert damage_taken == pokemon.max_hp  # Should only take actual HP
-        assert pokemon.current_hp == 0
-        assert pokemon.is_fainted is True
+        assert damage_taken == expected_taken
+        assert pokemon.current_hp == _HP_100 - expected_taken
+        assert pokemon.is_fainted is fainted
     
-    def test_status_effects(self):
-        stats = {'hp': 100, 'attack': 100, 'defense': 100, 
-                'special_attack': 100, 'special_defense': 100, 'speed': 100}
-        moves = [Move("tackle", 40, 100, 35, "normal", "physical")]
-        
-        pokemon = Pokemon("test", stats, ["normal"], moves)
+    def test_status_effects(self, make_pokemon):
+        pokemon = make_pokemon()
         
         # Apply paralysis
         pokemon.apply_status_effect(StatusEffect.PARALYSIS, 3)
@@ -100,50 +118,110 @@ class TestPokemon:
         # Process status effects
         can_act, message = pokemon.process_status_effects()
         assert pokemon.status_turns == 2  # Should decrease
+    
+    def test_use_move_tracks_usable_moves(self, make_pokemon, default_moves):
+        pokemon = make_pokemon(moves=(Move("splash", 0, 100, 1, "normal", "status"),) + default_moves)
+        assert pokemon.usable_move_idx == [0, 1]
+        
+        assert pokemon.use_move(0).name == "splash"
+        assert pokemon.usable_move_idx == [1]
+
+# (attacking type, defending types, expected multiplier)
+TYPE_EFFECTIVENESS_CASES = (
+    ("water", ("fire",), 2.0),               # super effective
+    ("water", ("grass",), 0.5),              # not very effective
+    ("electric", ("ground",), 0.0),          # no effect
+    ("normal", ("normal",), 1.0),            # neutral
+    ("fire", ("grass", "ice"), 4.0),         # dual type: 2x * 2x
+    ("electric", ("ground", "water"), 0.0),  # immunity overrides the other type
+    ("shadow", ("fire",), 1.0),              # unknown attacking type is neutral
+    ("water", ("shadow", "fire"), 2.0),      # unknown defending type is ignored
+)
 
 class TestTypeEffectiveness:
     
-    def test_super_effective(self):
-        # Water vs Fire should be 2x
-        multiplier = TypeEffectiveness.get_multiplier("water", ["fire"])
-        assert multiplier == 2.0
-    
-    def test_not_very_effective(self):
-        # Water vs Grass should be 0.5x
-        multiplier = TypeEffectiveness.get_multiplier("water", ["grass"])
-        assert multiplier == 0.5
-    
-    def test_no_effect(self):
-        # Electric vs Ground should be 0x
-        multiplier = TypeEffectiveness.get_multiplier("electric", ["ground"])
-        assert multiplier == 0.0
-    
-    def test_normal_effectiveness(self):
-        # Normal vs Normal should be 1x
-        multiplier = TypeEffectiveness.get_multiplier("normal", ["normal"])
-        assert multiplier == 1.0
-    
-    def test_dual_type_effectiveness(self):
-        # Fire vs Grass/Ice should be 2x * 2x = 4x
-        multiplier = TypeEffectiveness.get_multiplier("fire", ["grass", "ice"])
-        assert multiplier == 4.0
+    @pytest.mark.parametrize("attack_type,defend_types,expected", TYPE_EFFECTIVENESS_CASES)
+    def test_multiplier(self, attack_type, defend_types, expected):
+        assert TypeEffectiveness.get_multiplier(attack_type, list(defend_types)) == expected
+    
+    def test_tables_are_read_only(self):
+        with pytest.raises(ValueError):
+            TYPE_CHART[0, 0] = 0
+        with pytest.raises(TypeError):
+            MOVE_STATUS["tackle"] = (StatusEffect.BURN, 1.0)
 
-class TestBattleCalculator:
+class TestRNGPool:
     
-    def test_damage_calculation_basic(self):
-        # Create test Pokémon
-        stats1 = {'hp': 100, 'attack': 100, 'defense': 100, 
-                 'special_attack': 100, 'special_defense': 100, 'speed': 100}
-        stats2 = {'hp': 100, 'attack': 100, 'defense': 100, 
-                 'special_attack': 100, 'special_defense': 100, 'speed': 100}
+    def test_seed_is_reproducible_across_refills(self, seeded_rng):
+        count = RNGPool.BATCH_SIZE + 10
+        RNGPool.seed(7)
+        first = [RNGPool.next_uniform() for _ in range(count)]
+        RNGPool.seed(7)
+        assert [RNGPool.next_uniform() for _ in range(count)] == first
+        assert all(0.0 <= u < 1.0 for u in first)
+    
+    def test_next_int_range(self):
+        assert {RNGPool.next_int(3) for _ in range(300)} == {0, 1, 2}
+    
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs os.fork")
+    def test_forked_children_draw_different_streams(self, seeded_rng):
+        RNGPool.next_uniform()
+        draws = []
+        for _ in range(2):
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(read_fd)
+                os.write(write_fd, repr(RNGPool.next_uniform()).encode())
+                os._exit(0)
+            os.close(write_fd)
+            with os.fdopen(read_fd) as pipe:
+                draws.append(pipe.read())
+            os.waitpid(pid, 0)
+        
+        assert draws[0] != draws[1]
+
+class TestBatchBattle:
+    
+    def test_faster_one_shot_attacker_always_wins(self, seeded_rng):
+        # Enough power to faint the defender in one hit, and it always moves first
+        fast = Pokemon("fast", {**_STATS_100, 'speed': 150}, ["normal"], [Move("nuke", 250, 100, 5, "normal", "physical")])
+        slow = Pokemon("slow", _STATS_100, ["normal"], [Move("tackle", 40, 100, 35, "normal", "physical")])
+        
+        winners = simulate_battles_batch(slow, fast, 200)
+        
+        assert (winners == 2).all()
+    
+    def test_immune_defender_runs_out_the_clock(self, seeded_rng, make_pokemon):
+        # Normal moves only deal the 1-damage floor to a ghost, and the ghost has no damaging move
+        attacker = make_pokemon("attacker")
+        ghost = Pokemon("ghost", _STATS_100, ["ghost"], [Move("growl", 0, 100, 40, "normal", "status")])
         
-        moves1 = [Move("tackle", 40, 100, 35, "normal", "physical")]
-        moves2 = [Move("tackle", 40, 100, 35, "normal", "physical")]
+        state = BatchBattleState(attacker, ghost, 50)
+        winners = state.run(max_turns=10)
         
-        attacker = Pokemon("attacker", stats1, ["normal"], moves1)
-        defender = Pokemon("defender", stats2, ["normal"], moves2)
+        assert (winners == 0).all()
+        assert (state.hp[1] == _HP_100 - 10).all()
+        # One tackle per turn
+        assert (state.pp[0][:, 0] == 25).all()
+    
+    def test_starting_status_carries_over(self, seeded_rng, make_pokemon):
+        burned = make_pokemon("burned")
+        burned.apply_status_effect(StatusEffect.BURN)
+        
+        state = BatchBattleState(burned, make_pokemon("other"), 8)
+        
+        assert (state.status[0] == StatusEffect.BURN).all()
+        assert (state.status[1] == StatusEffect.NONE).all()
+        assert (state.status_turns[0] == 3).all()
+
+class TestBattleCalculator:
+    
+    def test_damage_calculation_basic(self, make_pokemon):
+        attacker = make_pokemon("attacker")
+        defender = make_pokemon("defender")
         
-        move = moves1[0]
+        move = attacker.moves[0]
         
         damage, is_critical, type_effectiveness = BattleCalculator.calculate_damage(
             attacker, defender, move
@@ -151,39 +229,39 @@ class TestBattleCalculator:
         
         # Damage should be > 0 for a valid attack
         assert damage > 0
-        assert isinstance(is_critical, bool)
+        assert is_critical in (True, False)
         assert type_effectiveness == 1.0  # Normal vs Normal
     
-    def test_zero_power_move(self):
-        stats = {'hp': 100, 'attack': 100, 'defense': 100, 
-                'special_attack': 100, 'special_defense': 100, 'speed': 100}
+    def test_zero_power_move(self, make_pokemon):
         moves = [Move("status-move", 0, 100, 35, "normal", "status")]
         
-        attacker = Pokemon("attacker", stats, ["normal"], moves)
-        defender = Pokemon("defender", stats, ["normal"], moves)
+        attacker = make_pokemon("attacker", moves)
+        defender = make_pokemon("defender", moves)
         
         damage, is_critical, type_effectiveness = BattleCalculator.calculate_damage(
-            attacker, defender, moves[0]
+            attacker, defender, attacker.moves[0]
         )
         
         assert damage == 0
         assert is_critical is False
         assert type_effectiveness == 1.0
     
-    def test_burn_reduces_physical_attack(self):
-        stats = {'hp': 100, 'attack': 100, 'defense': 100, 
-                'special_attack': 100, 'special_defense': 100, 'speed': 100}
-        moves = [Move("tackle", 40, 100, 35, "normal", "physical")]
-        
-        attacker = Pokemon("attacker", stats, ["normal"], moves)
-        defender = Pokemon("defender", stats, ["normal"], moves)
+    def test_burn_reduces_physical_attack(self, make_pokemon):
+        attacker = make_pokemon("attacker")
+        defender = make_pokemon("defender")
+        tackle = attacker.moves[0]
         
         # Calculate normal damage
-        normal_damage, _, _ = BattleCalculator.calculate_damage(attacker, defender, moves[0])
+        normal_damage, _, _ = BattleCalculator.calculate_damage(attacker, defender, tackle)
         
         # Apply burn and calculate again
         attacker.apply_status_effect(StatusEffect.BURN)
-        burned_damage, _, _ = BattleCalculator.calculate_damage(attacker, defender, moves[0])
+        burned_damage, _, _ = BattleCalculator.calculate_damage(attacker, defender, tackle)
         
         # Burned damage should be less than normal damage
         assert burned_damage < normal_damage
+    
+    def test_damage_kernel_is_exact(self):
+        # Level 82, 90 power, 175 vs 63, crit and STAB: exactly 396, which float math truncates to 395
+        numerator, denominator = _base_damage(82, 90, 175, 63)
+        assert _damage_kernel(numerator, denominator, 3, 3, 4, 4, 100) == 396
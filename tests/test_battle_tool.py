@@ -3,19 +3,41 @@ Tests for Battle Tool MCP Implementation
 """
 
 import pytest
-import asyncio
-from unittest.mock import Mock, patch, AsyncMock
+from types import MappingProxyType
+from unittest.mock import Mock, patch
+from resources.pokemon_resource import PokemonResource
 from tools.battle_tool import BattleTool
+from tools.pokemon_battle import Pokemon
+
+_API_ERROR = RuntimeError("API Error")
+
+def _pokemon_stub(**attrs):
+    """A Pokemon-specced Mock that can always act; unknown methods fail loudly."""
+    # configure_mock, because Mock(name=...) would name the mock rather than set .name
+    stub = Mock(spec=Pokemon)
+    if 'name' in attrs:
+        attrs.setdefault('display_name', attrs['name'].title())
+    stub.configure_mock(**attrs)
+    stub.process_status_effects.return_value = (True, "")
+    return stub
+
+@pytest.fixture(scope="class")
+def battle_tool():
+    # Tests patch resource methods; the only state they share is the template cache,
+    # which no test using this fixture inspects
+    return BattleTool()
+
+@pytest.fixture
+def fresh_battle_tool():
+    # For tests that depend on what the template cache holds
+    return BattleTool()
 
 class TestBattleTool:
     
-    @pytest.fixture
-    def battle_tool(self):
-        return BattleTool()
-    
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def mock_pokemon_data(self):
-        return {
+        # Shared and read-only: tests hand it to mocks and parsers but never modify it
+        return MappingProxyType({
             'name': 'pikachu',
             'stats': {
                 'hp': 35, 'attack': 55, 'defense': 40,
@@ -40,49 +62,38 @@ class TestBattleTool:
                     'damage_class': 'physical'
                 }
             ]
-        }
+        })
     
+    @pytest.mark.asyncio
     @patch('tools.battle_tool.BattleTool._create_pokemon_from_data')
     @patch('resources.pokemon_resource.PokemonResource.get_pokemon_stats')
-    def test_simulate_battle_success(self, mock_get_stats, mock_create_pokemon, battle_tool, mock_pokemon_data):
+    async def test_simulate_battle_success(self, mock_get_stats, mock_create_pokemon, battle_tool, mock_pokemon_data):
         # Mock the resource calls
         mock_get_stats.return_value = mock_pokemon_data
         
         # Mock Pokemon creation
-        mock_pokemon1 = Mock()
-        mock_pokemon1.name = 'pikachu'
-        mock_pokemon1.current_hp = 100
-        mock_pokemon1.max_hp = 100
-        mock_pokemon1.attack = 55
-        mock_pokemon1.defense = 40
-        mock_pokemon1.special_attack = 50
-        mock_pokemon1.special_defense = 50
-        mock_pokemon1.speed = 90
-        mock_pokemon1.is_fainted = False
-        mock_pokemon1.process_status_effects.return_value = (True, "")
-        
-        mock_pokemon2 = Mock()
-        mock_pokemon2.name = 'charizard'
-        mock_pokemon2.current_hp = 150
-        mock_pokemon2.max_hp = 150
-        mock_pokemon2.attack = 84
-        mock_pokemon2.defense = 78
-        mock_pokemon2.special_attack = 109
-        mock_pokemon2.special_defense = 85
-        mock_pokemon2.speed = 100
-        mock_pokemon2.is_fainted = True  # Make it faint to end battle quickly
-        mock_pokemon2.process_status_effects.return_value = (True, "")
+        mock_pokemon1 = _pokemon_stub(
+            name='pikachu', current_hp=100, max_hp=100,
+            attack=55, defense=40, special_attack=50, special_defense=50, speed=90,
+            is_fainted=False
+        )
+        mock_pokemon2 = _pokemon_stub(
+            name='charizard', current_hp=150, max_hp=150,
+            attack=84, defense=78, special_attack=109, special_defense=85, speed=100,
+            is_fainted=True  # Make it faint to end battle quickly
+        )
         
         mock_create_pokemon.side_effect = [mock_pokemon1, mock_pokemon2]
         
         # Run the battle simulation
-        result = asyncio.run(battle_tool.simulate_battle('pikachu', 'charizard'))
+        result = await battle_tool.simulate_battle('pikachu', 'charizard')
         
         # Verify result is a string containing battle information
         assert isinstance(result, str)
         assert 'POKÉMON BATTLE SIMULATION' in result
         assert 'pikachu' in result.lower()
         assert 'charizard' in result.lower()
+        assert 'Pikachu wins!' in result
     
     def test_create_pokemon_from_data(self, battle_tool, mock_pokemon_data):
         pokemon = battle_tool._create_pokemon_from_data(mock_pokemon_data)
@@ -99,6 +110,30 @@ class TestBattleTool:
         assert pokemon.name == 'pikachu'
         assert len(pokemon.moves) <= 4  # Max 4 moves
     
+    def test_created_pokemon_do_not_share_state(self, fresh_battle_tool, mock_pokemon_data):
+        first = fresh_battle_tool._create_pokemon_from_data(mock_pokemon_data)
+        first.use_move(0)
+        first.take_damage(10)
+        
+        second = fresh_battle_tool._create_pokemon_from_data(mock_pokemon_data)
+        
+        assert len(fresh_battle_tool._templates) == 1
+        assert second.current_hp == second.max_hp
+        assert second.moves[0].current_pp == second.moves[0].pp
+        assert second.moves[0] is not first.moves[0]
+    
+    def test_refreshed_payload_rebuilds_template(self, fresh_battle_tool, mock_pokemon_data):
+        fresh_battle_tool._create_pokemon_from_data(mock_pokemon_data)
+        refreshed = {**mock_pokemon_data, 'stats': {**mock_pokemon_data['stats'], 'hp': 200}}
+        
+        pokemon = fresh_battle_tool._create_pokemon_from_data(refreshed)
+        
+        assert pokemon.base_hp == 200
+        # The refreshed template replaces the old one rather than sitting beside it
+        [(source, template)] = fresh_battle_tool._templates.values()
+        assert source is refreshed
+        assert template.base_hp == 200
+    
     def test_create_move_from_data(self, battle_tool):
         move_data = {
             'name': 'thunderbolt',
@@ -119,13 +154,55 @@ class TestBattleTool:
         assert move.type == 'electric'
         assert move.damage_class == 'special'
     
+    def test_uses_injected_resource(self):
+        resource = PokemonResource()
+        assert BattleTool(resource).pokemon_resource is resource
+    
+    @pytest.mark.asyncio
     @patch('resources.pokemon_resource.PokemonResource.get_pokemon_stats')
-    def test_simulate_battle_error_handling(self, mock_get_stats, battle_tool):
+    async def test_simulate_battle_error_handling(self, mock_get_stats, battle_tool):
         # Mock an exception
-        mock_get_stats.side_effect = Exception("API Error")
+        mock_get_stats.side_effect = _API_ERROR
         
-        result = asyncio.run(battle_tool.simulate_battle('invalid', 'pokemon'))
+        result = await battle_tool.simulate_battle('invalid', 'pokemon')
         
         assert isinstance(result, str)
         assert 'Battle simulation failed' in result
         assert 'API Error' in result
+    
+    @pytest.mark.asyncio
+    @patch('resources.pokemon_resource.PokemonResource.get_pokemon_stats')
+    async def test_simulate_battles_batch(self, mock_get_stats, battle_tool, mock_pokemon_data):
+        mock_get_stats.return_value = mock_pokemon_data
+        
+        winners = await battle_tool.simulate_battles_batch('pikachu', 'pikachu', 64)
+        
+        assert winners.shape == (64,)
+        assert set(winners.tolist()) <= {0, 1, 2}
+    
+    @pytest.mark.asyncio
+    @patch('resources.pokemon_resource.PokemonResource.get_pokemon_stats')
+    async def test_batch_win_rate_matches_scalar_engine(self, mock_get_stats, battle_tool, mock_pokemon_data,
+                                                        seeded_rng):
+        # A slightly faster Pikachu clone, so the matchup is close rather than one-sided
+        rival = {**mock_pokemon_data, 'name': 'raichu', 'stats': {**mock_pokemon_data['stats'], 'speed': 95}}
+        mock_get_stats.side_effect = lambda name: mock_pokemon_data if name == 'pikachu' else rival
+        n_sims = 2000
+        
+        results = [await battle_tool.simulate_battle('pikachu', 'raichu', verbose=False) for _ in range(n_sims)]
+        scalar_rate = sum('Pikachu wins!' in result for result in results) / n_sims
+        winners = await battle_tool.simulate_battles_batch('pikachu', 'raichu', n_sims)
+        
+        # The standard error of the difference is about 0.013 here
+        assert abs((winners == 1).mean() - scalar_rate) < 0.05
+    
+    @pytest.mark.asyncio
+    @patch('resources.pokemon_resource.PokemonResource.get_pokemon_stats')
+    async def test_simulate_battle_quiet(self, mock_get_stats, battle_tool, mock_pokemon_data):
+        mock_get_stats.return_value = mock_pokemon_data
+        
+        result = await battle_tool.simulate_battle('pikachu', 'pikachu', verbose=False)
+        
+        assert result.startswith("=== BATTLE RESULT ===")
+        assert "--- Turn 1 ---" not in result
+        assert "Final HP:" in result
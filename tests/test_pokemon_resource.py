@@ -4,8 +4,10 @@ Tests for Pokémon Resource Module
 
 import pytest
 import asyncio
-from unittest.mock import Mock, patch
-from resources.pokemon_resource import PokemonResource
+import httpx
+import respx
+from types import MappingProxyType
+from resources.pokemon_resource import PokemonResource, _pick_sprite
 
 class TestPokemonResource:
     
@@ -14,8 +16,15 @@ class TestPokemonResource:
         return PokemonResource()
     
     @pytest.fixture
+    def pokeapi(self):
+        # Routes are matched by URL at the transport layer, so request order doesn't matter
+        with respx.mock(base_url=PokemonResource.BASE_URL, assert_all_called=False) as router:
+            yield router
+    
+    @pytest.fixture(scope="session")
     def mock_pokemon_data(self):
-        return {
+        # Session-wide and read-only; pass a dict() copy where a JSON body is needed
+        return MappingProxyType({
             'id': 25,
             'name': 'pikachu',
             'height': 4,
@@ -42,7 +51,7 @@ class TestPokemonResource:
                 {'move': {'name': 'thunderbolt'}},
                 {'move': {'name': 'agility'}}
             ]
-        }
+        })
     
     @pytest.fixture
     def mock_move_data(self):
@@ -61,21 +70,14 @@ class TestPokemonResource:
             ]
         }
     
-    @patch('requests.Session.get')
-    def test_get_pokemon_stats_success(self, mock_get, pokemon_resource, mock_pokemon_data, mock_move_data):
+    @pytest.mark.asyncio
+    async def test_get_pokemon_stats_success(self, pokeapi, pokemon_resource, mock_pokemon_data, mock_move_data):
         # Mock the API responses
-        mock_pokemon_response = Mock()
-        mock_pokemon_response.json.return_value = mock_pokemon_data
-        mock_pokemon_response.raise_for_status.return_value = None
-        
-        mock_move_response = Mock()
-        mock_move_response.json.return_value = mock_move_data
-        mock_move_response.raise_for_status.return_value = None
-        
-        mock_get.side_effect = [mock_pokemon_response, mock_move_response, mock_move_response, mock_move_response, mock_move_response]
+        pokeapi.get('/pokemon/pikachu').respond(json=dict(mock_pokemon_data))
+        pokeapi.get(path__startswith='/move/').respond(json=mock_move_data)
         
         # Test the method
-        result = asyncio.run(pokemon_resource.get_pokemon_stats('pikachu'))
+        result = await pokemon_resource.get_pokemon_stats('pikachu')
         
         # Assertions
         assert result['name'] == 'pikachu'
@@ -87,29 +89,199 @@ class TestPokemonResource:
         assert result['types'][0]['name'] == 'electric'
         assert len(result['abilities']) == 2
         assert result['abilities'][0]['name'] == 'static'
+        assert all(move['power'] == 40 for move in result['moves'])
     
-    @patch('requests.Session.get')
-    def test_get_pokemon_stats_not_found(self, mock_get, pokemon_resource):
+    @pytest.mark.asyncio
+    async def test_get_pokemon_stats_not_found(self, pokeapi, pokemon_resource):
         # Mock 404 response
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = Exception("404 Not Found")
-        mock_get.return_value = mock_response
+        pokeapi.get('/pokemon/nonexistent').respond(404)
         
         # Test that exception is raised
-        with pytest.raises(Exception) as exc_info:
-            asyncio.run(pokemon_resource.get_pokemon_stats('nonexistent'))
+        with pytest.raises(RuntimeError) as exc_info:
+            await pokemon_resource.get_pokemon_stats('nonexistent')
         
         assert "Failed to fetch Pokémon data" in str(exc_info.value)
     
-    def test_caching(self, pokemon_resource):
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("response", [
+        httpx.Response(200, content=b"<html>maintenance</html>"),  # not JSON
+        httpx.Response(200, json={'name': 'pikachu'}),            # missing keys
+    ])
+    async def test_get_pokemon_stats_bad_payload(self, pokeapi, pokemon_resource, response):
+        pokeapi.get('/pokemon/pikachu').mock(return_value=response)
+        
+        with pytest.raises(RuntimeError, match="Failed to fetch Pokémon data"):
+            await pokemon_resource.get_pokemon_stats('pikachu')
+    
+    @pytest.mark.asyncio
+    async def test_move_without_pp_gets_default(self, pokeapi, pokemon_resource, mock_move_data):
+        pokeapi.get('/move/thunder-shock').respond(json={**mock_move_data, 'pp': None})
+        
+        result = await pokemon_resource._get_move_details('thunder-shock')
+        
+        assert result['pp'] == 10
+    
+    @pytest.mark.asyncio
+    async def test_caching(self, pokemon_resource):
         # Test that results are cached
         pokemon_resource.cache['stats_pikachu'] = {'name': 'pikachu', 'cached': True}
         
-        result = asyncio.run(pokemon_resource.get_pokemon_stats('pikachu'))
+        result = await pokemon_resource.get_pokemon_stats('pikachu')
         assert result['cached'] is True
     
-    @patch('requests.Session.get')
-    def test_get_evolution_chain(self, mock_get, pokemon_resource):
+    def test_pick_sprite_preference_order(self):
+        sprites = {
+            'front_default': 'front.png',
+            'other': {
+                'official-artwork': {'front_default': None},
+                'home': {'front_default': 'home.png'}
+            }
+        }
+        assert _pick_sprite(sprites) == 'front.png'
+        
+        sprites['other']['official-artwork']['front_default'] = 'artwork.png'
+        assert _pick_sprite(sprites) == 'artwork.png'
+        
+        assert _pick_sprite({'other': None}) is None
+    
+    def test_cache_is_bounded(self, pokemon_resource):
+        # Oldest entries are evicted once the cache is full
+        for i in range(PokemonResource.CACHE_MAX_ENTRIES + 10):
+            pokemon_resource.cache[f'move_{i}'] = {'name': str(i)}
+        
+        assert len(pokemon_resource.cache) == PokemonResource.CACHE_MAX_ENTRIES
+        assert 'move_0' not in pokemon_resource.cache
+    
+    @pytest.mark.asyncio
+    async def test_aclose_releases_client(self, pokemon_resource):
+        session = pokemon_resource.session
+        await pokemon_resource.aclose()
+        
+        assert session.is_closed
+        assert pokemon_resource._session is None
+    
+    def test_loop_switch_closes_previous_client(self, pokemon_resource):
+        async def bind():
+            return pokemon_resource.session
+        
+        first = asyncio.run(bind())
+        
+        async def rebind():
+            pokemon_resource._bind_loop()
+            await asyncio.gather(*pokemon_resource._closing)
+        
+        asyncio.run(rebind())
+        
+        assert first.is_closed
+        assert pokemon_resource._session is not first
+        assert not pokemon_resource._closing
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_move_fetches_are_coalesced(self, pokeapi, pokemon_resource, mock_move_data):
+        route = pokeapi.get('/move/thunder-shock').respond(json=mock_move_data)
+        
+        first, second = await asyncio.gather(
+            pokemon_resource._get_move_details('thunder-shock'),
+            pokemon_resource._get_move_details('thunder-shock')
+        )
+        
+        assert first is second
+        assert route.call_count == 1
+        assert not pokemon_resource._inflight
+    
+    @pytest.mark.asyncio
+    async def test_move_fetch_concurrency_is_bounded(self, pokeapi, pokemon_resource, mock_move_data):
+        in_flight = 0
+        peak = 0
+        
+        async def slow_move(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json=mock_move_data)
+        
+        pokeapi.get(path__startswith='/move/').mock(side_effect=slow_move)
+        
+        results = await asyncio.gather(
+            *[pokemon_resource._get_move_details(f'move-{i}') for i in range(20)]
+        )
+        
+        assert len(results) == 20
+        assert peak == PokemonResource.MAX_CONCURRENT_FETCHES
+    
+    @pytest.mark.asyncio
+    async def test_warm_up_leaves_room_for_lookups(self, pokeapi, pokemon_resource, mock_pokemon_data, mock_move_data):
+        in_flight = 0
+        peak = 0
+        completed = 0
+        completed_before_lookup = None
+        
+        async def slow_move(request):
+            nonlocal in_flight, peak, completed, completed_before_lookup
+            if request.url.path.endswith('/lookup'):
+                completed_before_lookup = completed
+                return httpx.Response(200, json=mock_move_data)
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            completed += 1
+            return httpx.Response(200, json=mock_move_data)
+        
+        many_moves = {**mock_pokemon_data, 'moves': [{'move': {'name': f'move-{i}'}} for i in range(20)]}
+        pokeapi.get('/pokemon/pikachu').respond(json=many_moves)
+        pokeapi.get(path__startswith='/move/').mock(side_effect=slow_move)
+        
+        warm_up = asyncio.ensure_future(pokemon_resource.warm(['pikachu']))
+        await asyncio.sleep(0.005)
+        # An interactive lookup started mid warm-up is not queued behind the whole roster
+        await pokemon_resource._get_move_details('lookup')
+        results = await warm_up
+        
+        assert len(results[0]['moves']) == 20
+        assert peak == PokemonResource.MAX_BACKGROUND_FETCHES
+        assert completed_before_lookup <= PokemonResource.MAX_BACKGROUND_FETCHES
+    
+    @pytest.mark.asyncio
+    async def test_lookup_of_warming_pokemon_is_not_held_back(self, pokeapi, pokemon_resource, mock_pokemon_data, mock_move_data):
+        roster = ['pikachu'] + [f'pokemon-{i}' for i in range(19)]
+        others_fetched = 0
+        
+        async def slow(request, payload):
+            nonlocal others_fetched
+            await asyncio.sleep(0.01)
+            if request.url.path.startswith('/api/v2/pokemon/pokemon-'):
+                others_fetched += 1
+            return httpx.Response(200, json=payload)
+        
+        pokeapi.get(path__startswith='/pokemon/').mock(side_effect=lambda r: slow(r, dict(mock_pokemon_data)))
+        pokeapi.get(path__startswith='/move/').mock(side_effect=lambda r: slow(r, mock_move_data))
+        
+        warm_up = asyncio.ensure_future(pokemon_resource.warm(roster))
+        await asyncio.sleep(0.005)
+        assert 'stats_pikachu' in pokemon_resource._inflight
+        # Joining the warm-up's fetch would queue pikachu's moves behind the rest of the roster
+        result = await pokemon_resource.get_pokemon_stats('pikachu')
+        fetched_before_lookup = others_fetched
+        await warm_up
+        
+        assert result['name'] == 'pikachu'
+        assert fetched_before_lookup < len(roster) // 2
+    
+    @pytest.mark.asyncio
+    async def test_move_details_fallback_on_unexpected_payload(self, pokeapi, pokemon_resource):
+        pokeapi.get('/move/thunder-shock').respond(json={'name': 'thunder-shock'})
+        
+        result = await pokemon_resource._get_move_details('thunder-shock')
+        
+        assert result['name'] == 'thunder-shock'
+        assert result['power'] is None
+        assert result['type'] == 'normal'
+    
+    @pytest.mark.asyncio
+    async def test_get_evolution_chain(self, pokeapi, pokemon_resource):
         # Mock species response
         mock_species_data = {
             'evolution_chain': {
@@ -139,19 +311,13 @@ class TestPokemonResource:
             }
         }
         
-        mock_species_response = Mock()
-        mock_species_response.json.return_value = mock_species_data
-        mock_species_response.raise_for_status.return_value = None
-        
-        mock_evolution_response = Mock()
-        mock_evolution_response.json.return_value = mock_evolution_data
-        mock_evolution_response.raise_for_status.return_value = None
-        
-        mock_get.side_effect = [mock_species_response, mock_evolution_response]
+        pokeapi.get('/pokemon-species/pikachu').respond(json=mock_species_data)
+        pokeapi.get('/evolution-chain/10/').respond(json=mock_evolution_data)
         
-        result = asyncio.run(pokemon_resource.get_evolution_chain('pikachu'))
+        result = await pokemon_resource.get_evolution_chain('pikachu')
         
         assert result['id'] == 10
         assert result['evolution_chain']['species_name'] == 'pichu'
         assert len(result['evolution_chain']['evolves_to']) == 1
         assert result['evolution_chain']['evolves_to'][0]['species_name'] == 'pikachu'
+        assert result['evolution_chain']['evolves_to'][0]['evolves_to'][0]['species_name'] == 'raichu'
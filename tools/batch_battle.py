@@ -0,0 +1,151 @@
+"""
+Batch Battle Simulation
+Runs many independent battles between the same two Pokémon in lockstep with NumPy.
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+from tools.pokemon_battle import (
+    Move, Pokemon, StatusEffect, RNGPool, TypeEffectiveness, STATUS_DIVISOR, _base_damage, _damage_kernel,
+)
+
+# Array form of STATUS_DIVISOR, for gathering over a whole status column
+_STATUS_DIVISOR = np.array(STATUS_DIVISOR, dtype=np.int32)
+
+class _MoveTable:
+    """Per-move constants for one attacker against one defender, as arrays indexed by move slot."""
+
+    def __init__(self, attacker: Pokemon, defender: Pokemon):
+        moves = attacker.moves
+        self.power = np.array([m.power for m in moves], dtype=np.int32)
+        self.accuracy = np.array([m.accuracy for m in moves], dtype=np.int32)
+        self.physical = np.array([m.damage_class == "physical" for m in moves])
+        self.stab_halves = np.array([m.stab_halves for m in moves], dtype=np.int64)
+        type_fractions = [TypeEffectiveness.get_quarters_by_id(m.type_id, defender.type_ids) for m in moves]
+        self.type_quarters = np.array([q for q, _ in type_fractions], dtype=np.int64)
+        self.type_scale = np.array([scale for _, scale in type_fractions], dtype=np.int64)
+
+        # Base damage fractions with and without the burn penalty; only physical moves ever use the latter
+        self.base = np.array([self._base(attacker, defender, m, False) for m in moves], dtype=np.int64)
+        self.burned_base = np.array([self._base(attacker, defender, m, True) for m in moves], dtype=np.int64)
+
+        effects = [m.status_effect or (StatusEffect.NONE, 0.0) for m in moves]
+        self.status = np.array([s for s, _ in effects], dtype=np.int8)
+        self.status_chance = np.array([chance for _, chance in effects])
+
+    @staticmethod
+    def _base(attacker: Pokemon, defender: Pokemon, move: Move, burned: bool) -> Tuple[int, int]:
+        if move.power == 0:
+            return 0, 1
+        if move.damage_class == "physical":
+            attack_stat = attacker.attack // 2 if burned else attacker.attack
+            return _base_damage(attacker.level, move.power, attack_stat, defender.defense)
+        return _base_damage(attacker.level, move.power, attacker.special_attack, defender.special_defense)
+
+class BatchBattleState:
+    """
+    HP, status and PP columns for N battles between the same two Pokémon.
+    Index 0 is the first Pokémon and index 1 the second; every column has shape (N,).
+    """
+
+    def __init__(self, pokemon1: Pokemon, pokemon2: Pokemon, n_sims: int,
+                 rng: Optional[np.random.Generator] = None):
+        self.pokemon = (pokemon1, pokemon2)
+        self.n_sims = n_sims
+        self.rng = rng if rng is not None else RNGPool.rng
+
+        self.hp = [np.full(n_sims, p.current_hp, dtype=np.int32) for p in self.pokemon]
+        self.status = [np.full(n_sims, p.status, dtype=np.int8) for p in self.pokemon]
+        self.status_turns = [np.full(n_sims, p.status_turns, dtype=np.int32) for p in self.pokemon]
+        self.pp = [
+            np.tile(np.array([m.current_pp for m in p.moves], dtype=np.int32), (n_sims, 1))
+            for p in self.pokemon
+        ]
+        self.move_tables = (_MoveTable(pokemon1, pokemon2), _MoveTable(pokemon2, pokemon1))
+
+    def run(self, max_turns: int = 50) -> np.ndarray:
+        """
+        Advance all battles until each ends or hits max_turns.
+        Returns the winner per battle: 1 or 2, or 0 for a draw or turn limit.
+        """
+        hp1, hp2 = self.hp
+        first, second = (0, 1) if self.pokemon[0].speed >= self.pokemon[1].speed else (1, 0)
+
+        for _ in range(max_turns):
+            active = (hp1 > 0) & (hp2 > 0)
+            if not active.any():
+                break
+
+            self._attack(first, active)
+            self._attack(second, active & (hp1 > 0) & (hp2 > 0))
+
+            # End-of-turn status for every Pokémon still standing in a battle that ran this turn
+            for side in (0, 1):
+                self._process_status(side, active & (self.hp[side] > 0))
+
+        fainted1, fainted2 = hp1 == 0, hp2 == 0
+        return np.where(fainted2 & ~fainted1, 1, np.where(fainted1 & ~fainted2, 2, 0)).astype(np.int8)
+
+    def _process_status(self, side: int, mask: np.ndarray) -> np.ndarray:
+        """Vector form of Pokemon.process_status_effects; returns which battles may act."""
+        status, turns, hp = self.status[side], self.status_turns[side], self.hp[side]
+        afflicted = mask & (status != StatusEffect.NONE)
+
+        can_act = ~(afflicted & (status == StatusEffect.PARALYSIS) & (self.rng.random(self.n_sims) < 0.25))
+
+        divisor = np.take(_STATUS_DIVISOR, status)
+        hurt = afflicted & (divisor > 0)
+        damage = np.maximum(1, self.pokemon[side].max_hp // np.maximum(divisor, 1))
+        hp[hurt] = np.maximum(hp[hurt] - damage[hurt], 0)
+
+        turns[afflicted] -= 1
+        status[afflicted & (turns <= 0)] = StatusEffect.NONE
+        return can_act
+
+    def _attack(self, side: int, mask: np.ndarray):
+        """Vector form of BattleTool._execute_turn for the Pokémon at index side."""
+        n = self.n_sims
+        rng = self.rng
+        table = self.move_tables[side]
+        defender = 1 - side
+
+        acting = mask & self._process_status(side, mask) & (self.hp[side] > 0)
+
+        # Pick uniformly among moves with PP left
+        pp = self.pp[side]
+        usable = pp > 0
+        count = usable.sum(axis=1)
+        acting &= count > 0
+        pick = (rng.random(n) * count).astype(np.int64)
+        choice = (usable.cumsum(axis=1) > pick[:, None]).argmax(axis=1)
+        rows = np.flatnonzero(acting)
+        pp[rows, choice[rows]] -= 1
+
+        hit = acting & (table.power[choice] > 0) & (rng.integers(1, 101, n) <= table.accuracy[choice])
+
+        burned = (self.status[side] == StatusEffect.BURN) & table.physical[choice]
+        base = np.where(burned[:, None], table.burned_base[choice], table.base[choice])
+        critical_halves = np.where(rng.random(n) < 0.0625, 3, 2)
+        random_percent = 85 + rng.integers(0, 16, n)
+        damage = _damage_kernel(
+            base[:, 0], base[:, 1], critical_halves, table.stab_halves[choice],
+            table.type_quarters[choice], table.type_scale[choice], random_percent
+        )
+        damage = np.maximum(1, damage).astype(np.int32)
+
+        hp = self.hp[defender]
+        hp[hit] = np.maximum(hp[hit] - damage[hit], 0)
+
+        # Secondary status only lands on a defender without one, as in Pokemon.apply_status_effect
+        status = self.status[defender]
+        inflict = (
+            hit & (table.status[choice] != StatusEffect.NONE) & (status == StatusEffect.NONE)
+            & (rng.random(n) < table.status_chance[choice])
+        )
+        status[inflict] = table.status[choice][inflict]
+        self.status_turns[defender][inflict] = 3
+
+def simulate_battles_batch(pokemon1: Pokemon, pokemon2: Pokemon, n_sims: int,
+                           max_turns: int = 50) -> np.ndarray:
+    """Run n_sims battles from the given starting state; see BatchBattleState.run."""
+    return BatchBattleState(pokemon1, pokemon2, n_sims).run(max_turns)
@@ -3,25 +3,44 @@ Battle Tool Module
 MCP tool implementation for Pokémon battle simulation.
 """
 
-import json
-import random
-from typing import Dict, List, Optional, Any
+import io
+from operator import itemgetter
+from cachetools import LRUCache
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional
 from resources.pokemon_resource import PokemonResource
-from tools.pokemon_battle import Pokemon, Move, BattleCalculator, StatusEffect
+from tools.pokemon_battle import Pokemon, Move, BattleCalculator, StatusEffect, RNGPool
+from tools.batch_battle import simulate_battles_batch
+
+# PokemonResource always emits every move field, so they can be fetched in one C-level call
+_MOVE_FIELDS = itemgetter('name', 'power', 'accuracy', 'pp', 'type', 'damage_class', 'effect')
+
+# Log wording for a status landing on the defender
+_INFLICTED = {
+    StatusEffect.PARALYSIS: "paralyzed",
+    StatusEffect.BURN: "burned",
+    StatusEffect.POISON: "poisoned",
+}
 
 class BattleTool:
     """MCP tool for simulating Pokémon battles."""
     
-    def __init__(self):
-        self.pokemon_resource = PokemonResource()
+    # Built Pokémon kept as templates, keyed by (name, custom moves), with the payload they came from
+    TEMPLATE_CACHE_MAX_ENTRIES = 1024
+    
+    def __init__(self, pokemon_resource: Optional[PokemonResource] = None):
+        # Share the caller's resource so its connection pool and cache are reused
+        self.pokemon_resource = pokemon_resource or PokemonResource()
         self.battle_calculator = BattleCalculator()
+        self._templates = LRUCache(maxsize=self.TEMPLATE_CACHE_MAX_ENTRIES)
     
     async def simulate_battle(self, pokemon1_name: str, pokemon2_name: str, 
                             moves1: Optional[List[str]] = None, 
-                            moves2: Optional[List[str]] = None) -> str:
+                            moves2: Optional[List[str]] = None,
+                            verbose: bool = True) -> str:
         """
         Simulate a battle between two Pokémon.
-        Returns a detailed battle log as a string.
+        Returns a detailed battle log as a string; with verbose=False only the result and final HP.
         """
         try:
             # Fetch Pokémon data
@@ -32,83 +51,111 @@ class BattleTool:
             pokemon1 = self._create_pokemon_from_data(pokemon1_data, moves1)
             pokemon2 = self._create_pokemon_from_data(pokemon2_data, moves2)
             
-            # Start battle simulation
-            battle_log = []
-            battle_log.append("=== POKÉMON BATTLE SIMULATION ===")
-            battle_log.append(f"{pokemon1.name.title()} vs {pokemon2.name.title()}")
-            battle_log.append("")
-            
-            # Display initial stats
-            battle_log.append("Initial Stats:")
-            battle_log.append(f"{pokemon1.name.title()}: HP {pokemon1.current_hp}/{pokemon1.max_hp}, "
-                            f"ATK {pokemon1.attack}, DEF {pokemon1.defense}, "
-                            f"SP.ATK {pokemon1.special_attack}, SP.DEF {pokemon1.special_defense}, "
-                            f"SPD {pokemon1.speed}")
-            battle_log.append(f"{pokemon2.name.title()}: HP {pokemon2.current_hp}/{pokemon2.max_hp}, "
-                            f"ATK {pokemon2.attack}, DEF {pokemon2.defense}, "
-                            f"SP.ATK {pokemon2.special_attack}, SP.DEF {pokemon2.special_defense}, "
-                            f"SPD {pokemon2.speed}")
-            battle_log.append("")
+            # Start battle simulation; every turn-by-turn line is skipped, unformatted, when not verbose
+            buf = io.StringIO()
+            log = buf.write
+            if verbose:
+                log("=== POKÉMON BATTLE SIMULATION ===\n")
+                log(f"{pokemon1.display_name} vs {pokemon2.display_name}\n")
+                log("\n")
+                
+                # Display initial stats
+                log("Initial Stats:\n")
+                log(f"{pokemon1.display_name}: HP {pokemon1.current_hp}/{pokemon1.max_hp}, "
+                    f"ATK {pokemon1.attack}, DEF {pokemon1.defense}, "
+                    f"SP.ATK {pokemon1.special_attack}, SP.DEF {pokemon1.special_defense}, "
+                    f"SPD {pokemon1.speed}\n")
+                log(f"{pokemon2.display_name}: HP {pokemon2.current_hp}/{pokemon2.max_hp}, "
+                    f"ATK {pokemon2.attack}, DEF {pokemon2.defense}, "
+                    f"SP.ATK {pokemon2.special_attack}, SP.DEF {pokemon2.special_defense}, "
+                    f"SPD {pokemon2.speed}\n")
+                log("\n")
             
             # Battle loop
             turn = 1
             max_turns = 50  # Prevent infinite battles
             
+            # Turn order is by speed, which never changes mid-battle
+            if pokemon1.speed >= pokemon2.speed:
+                first, second = pokemon1, pokemon2
+            else:
+                first, second = pokemon2, pokemon1
+            both = (pokemon1, pokemon2)
+            
             while not pokemon1.is_fainted and not pokemon2.is_fainted and turn <= max_turns:
-                battle_log.append(f"--- Turn {turn} ---")
-                
-                # Determine turn order based on speed
-                if pokemon1.speed >= pokemon2.speed:
-                    first, second = pokemon1, pokemon2
-                else:
-                    first, second = pokemon2, pokemon1
+                if verbose:
+                    log(f"--- Turn {turn} ---\n")
                 
                 # First Pokémon's turn
                 if not first.is_fainted:
-                    turn_result = self._execute_turn(first, second, battle_log)
-                    if turn_result:
-                        battle_log.extend(turn_result)
+                    self._execute_turn(first, second, log, verbose)
                 
                 # Second Pokémon's turn (if still alive)
                 if not second.is_fainted and not first.is_fainted:
-                    turn_result = self._execute_turn(second, first, battle_log)
-                    if turn_result:
-                        battle_log.extend(turn_result)
+                    self._execute_turn(second, first, log, verbose)
                 
                 # Process status effects
-                for pokemon in [pokemon1, pokemon2]:
+                for pokemon in both:
                     if not pokemon.is_fainted:
                         can_act, status_msg = pokemon.process_status_effects()
-                        if status_msg:
-                            battle_log.append(status_msg)
+                        if verbose and status_msg:
+                            log(status_msg + "\n")
                 
-                battle_log.append("")
+                if verbose:
+                    log("\n")
                 turn += 1
             
-            # Determine winner
-            battle_log.append("=== BATTLE RESULT ===")
+            # Determine winner; the result is always written
+            log("=== BATTLE RESULT ===\n")
             if pokemon1.is_fainted and pokemon2.is_fainted:
-                battle_log.append("It's a draw! Both Pokémon fainted!")
+                log("It's a draw! Both Pokémon fainted!\n")
             elif pokemon1.is_fainted:
-                battle_log.append(f"{pokemon2.name.title()} wins!")
+                log(f"{pokemon2.display_name} wins!\n")
             elif pokemon2.is_fainted:
-                battle_log.append(f"{pokemon1.name.title()} wins!")
+                log(f"{pokemon1.display_name} wins!\n")
             else:
-                battle_log.append("Battle ended due to turn limit!")
+                log("Battle ended due to turn limit!\n")
             
-            battle_log.append("")
-            battle_log.append("Final HP:")
-            battle_log.append(f"{pokemon1.name.title()}: {pokemon1.current_hp}/{pokemon1.max_hp}")
-            battle_log.append(f"{pokemon2.name.title()}: {pokemon2.current_hp}/{pokemon2.max_hp}")
+            log("\n")
+            log("Final HP:\n")
+            log(f"{pokemon1.display_name}: {pokemon1.current_hp}/{pokemon1.max_hp}\n")
+            log(f"{pokemon2.display_name}: {pokemon2.current_hp}/{pokemon2.max_hp}")
             
-            return "\n".join(battle_log)
+            return buf.getvalue()
             
-        except Exception as e:
+        except RuntimeError as e:
+            # Fetch failures from the resource; anything else is a bug and should surface
             return f"Battle simulation failed: {str(e)}"
     
+    async def simulate_battles_batch(self, pokemon1_name: str, pokemon2_name: str, n_sims: int,
+                                     moves1: Optional[List[str]] = None,
+                                     moves2: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Simulate n_sims independent battles at once, without logs.
+        Returns the winner of each battle: 1 or 2, or 0 for a draw or turn limit.
+        """
+        pokemon1_data = await self.pokemon_resource.get_pokemon_stats(pokemon1_name)
+        pokemon2_data = await self.pokemon_resource.get_pokemon_stats(pokemon2_name)
+        
+        pokemon1 = self._create_pokemon_from_data(pokemon1_data, moves1)
+        pokemon2 = self._create_pokemon_from_data(pokemon2_data, moves2)
+        
+        return simulate_battles_batch(pokemon1, pokemon2, n_sims)
+    
     def _create_pokemon_from_data(self, pokemon_data: Dict[str, Any], 
                                 custom_moves: Optional[List[str]] = None) -> Pokemon:
-        """Create a Pokemon instance from API data."""
+        """Create a Pokemon instance from API data, cloned from a cached template."""
+        key = (pokemon_data['name'], tuple(custom_moves or ()))
+        cached = self._templates.get(key)
+        # Reuse only a template built from this very payload; a refreshed one gets rebuilt.
+        # The entry holds the payload, so the identity check cannot match a recycled object.
+        if cached is None or cached[0] is not pokemon_data:
+            cached = self._templates[key] = (pokemon_data, self._build_pokemon(pokemon_data, custom_moves))
+        return cached[1].clone()
+    
+    def _build_pokemon(self, pokemon_data: Dict[str, Any], 
+                       custom_moves: Optional[List[str]] = None) -> Pokemon:
+        """Build a fresh Pokemon from API data."""
         stats = pokemon_data['stats']
         types = [t['name'] for t in pokemon_data['types']]
         
@@ -143,6 +190,12 @@ class BattleTool:
     
     def _create_move_from_data(self, move_data: Dict[str, Any]) -> Move:
         """Create a Move instance from API data."""
+        try:
+            return Move(*_MOVE_FIELDS(move_data))
+        except KeyError:
+            pass
+        
+        # Partial move data: fill in defaults for the missing fields
         return Move(
             name=move_data['name'],
             power=move_data.get('power', 60),
@@ -153,26 +206,25 @@ class BattleTool:
             effect=move_data.get('effect')
         )
     
-    def _execute_turn(self, attacker: Pokemon, defender: Pokemon, battle_log: List[str]) -> List[str]:
-        """Execute a single turn for a Pokémon."""
-        turn_log = []
-        
+    def _execute_turn(self, attacker: Pokemon, defender: Pokemon, log: Callable[[str], Any],
+                      verbose: bool = True):
+        """Execute a single turn for a Pokémon, writing its lines to log when verbose."""
         # Check if Pokémon can act (status effects)
         can_act, status_msg = attacker.process_status_effects()
-        if status_msg:
-            turn_log.append(status_msg)
+        if verbose and status_msg:
+            log(status_msg + "\n")
         
         if not can_act or attacker.is_fainted:
-            return turn_log
+            return
         
-        # Choose a random move
-        available_moves = [move for move in attacker.moves if move.can_use()]
-        if not available_moves:
-            turn_log.append(f"{attacker.name.title()} has no moves left!")
-            return turn_log
+        # Choose a random move among those with PP left
+        usable = attacker.usable_move_idx
+        if not usable:
+            if verbose:
+                log(f"{attacker.display_name} has no moves left!\n")
+            return
         
-        chosen_move = random.choice(available_moves)
-        chosen_move.use()
+        chosen_move = attacker.use_move(usable[RNGPool.next_int(len(usable))])
         
         # Calculate damage
         damage, is_critical, type_effectiveness = self.battle_calculator.calculate_damage(
@@ -180,44 +232,41 @@ class BattleTool:
         )
         
         if damage == 0:
-            turn_log.append(f"{attacker.name.title()} used {chosen_move.name.title()}, but it missed!")
-            return turn_log
+            if verbose:
+                log(f"{attacker.display_name} used {chosen_move.display_name}, but it missed!\n")
+            return
         
         # Apply damage
         actual_damage = defender.take_damage(damage)
         
-        # Build attack message
-        attack_msg = f"{attacker.name.title()} used {chosen_move.name.title()}!"
-        if is_critical:
-            attack_msg += " Critical hit!"
-        
-        turn_log.append(attack_msg)
-        
-        # Type effectiveness message
-        if type_effectiveness > 1.0:
-            turn_log.append("It's super effective!")
-        elif type_effectiveness < 1.0 and type_effectiveness > 0:
-            turn_log.append("It's not very effective...")
-        elif type_effectiveness == 0:
-            turn_log.append("It has no effect!")
-        
-        if actual_damage > 0:
-            turn_log.append(f"{defender.name.title()} took {actual_damage} damage! "
-                          f"({defender.current_hp}/{defender.max_hp} HP remaining)")
+        if verbose:
+            # Build attack message
+            attack_msg = f"{attacker.display_name} used {chosen_move.display_name}!"
+            if is_critical:
+                attack_msg += " Critical hit!"
+            
+            log(attack_msg + "\n")
+            
+            # Type effectiveness message
+            if type_effectiveness > 1.0:
+                log("It's super effective!\n")
+            elif type_effectiveness < 1.0 and type_effectiveness > 0:
+                log("It's not very effective...\n")
+            elif type_effectiveness == 0:
+                log("It has no effect!\n")
+            
+            if actual_damage > 0:
+                log(f"{defender.display_name} took {actual_damage} damage! "
+                    f"({defender.current_hp}/{defender.max_hp} HP remaining)\n")
         
         # Check for status effect application (simplified)
-        if chosen_move.name in ["thunder-wave", "thunderbolt"] and random.random() < 0.3:
-            defender.apply_status_effect(StatusEffect.PARALYSIS)
-            turn_log.append(f"{defender.name.title()} is paralyzed!")
-        elif chosen_move.name in ["flamethrower", "fire-blast"] and random.random() < 0.1:
-            defender.apply_status_effect(StatusEffect.BURN)
-            turn_log.append(f"{defender.name.title()} is burned!")
-        elif chosen_move.name in ["poison-powder", "sludge-bomb"] and random.random() < 0.3:
-            defender.apply_status_effect(StatusEffect.POISON)
-            turn_log.append(f"{defender.name.title()} is poisoned!")
+        if chosen_move.status_effect:
+            status, chance = chosen_move.status_effect
+            if RNGPool.next_uniform() < chance:
+                defender.apply_status_effect(status)
+                if verbose:
+                    log(f"{defender.display_name} is {_INFLICTED[status]}!\n")
         
         # Check if defender fainted
-        if defender.is_fainted:
-            turn_log.append(f"{defender.name.title()} fainted!")
-        
-        return turn_log
+        if verbose and defender.is_fainted:
+            log(f"{defender.display_name} fainted!\n")
@@ -3,17 +3,20 @@ Pokémon Battle System
 Core classes and mechanics for Pokémon battle simulation.
 """
 
-import random
-import math
-from enum import Enum
+import copy
+import os
+from functools import lru_cache
+from types import MappingProxyType
+import numpy as np
+from enum import Enum, IntEnum
 from typing import Dict, List, Optional, Tuple
-from pydantic import BaseModel
 
-class StatusEffect(Enum):
-    NONE = "none"
-    PARALYSIS = "paralysis"
-    BURN = "burn"
-    POISON = "poison"
+class StatusEffect(IntEnum):
+    # Small ints so comparisons take the int fast path and they fit NumPy status columns
+    NONE = 0
+    PARALYSIS = 1
+    BURN = 2
+    POISON = 3
 
 class DamageClass(Enum):
     PHYSICAL = "physical"
@@ -40,17 +43,72 @@ class PokemonType(Enum):
     STEEL = "steel"
     FAIRY = "fairy"
 
+# Dense integer id per type, in PokemonType order; types outside it have no id and are neutral
+TYPE_ID = MappingProxyType({t.value: i for i, t in enumerate(PokemonType)})
+
+class RNGPool:
+    """Uniform [0, 1) draws generated in NumPy batches and served one at a time."""
+    
+    BATCH_SIZE = 8192
+    rng = np.random.default_rng()
+    # Kept as a Python list so each draw is a plain float, not a NumPy scalar
+    uniforms: List[float] = []
+    idx = 0
+    
+    @classmethod
+    def seed(cls, seed: Optional[int] = None):
+        """Reseed the generator and drop any pre-drawn values."""
+        cls.rng = np.random.default_rng(seed)
+        cls.uniforms = []
+        cls.idx = 0
+    
+    @classmethod
+    def next_uniform(cls) -> float:
+        idx = cls.idx
+        if idx >= len(cls.uniforms):
+            cls.uniforms = cls.rng.random(cls.BATCH_SIZE).tolist()
+            idx = 0
+        cls.idx = idx + 1
+        return cls.uniforms[idx]
+    
+    @classmethod
+    def next_int(cls, n: int) -> int:
+        """Uniform integer in [0, n)."""
+        return int(cls.next_uniform() * n)
+
+# A forked child would otherwise replay its parent's stream; random reseeds itself the same way
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=RNGPool.seed)
+
+# End-of-turn damage as a max-HP divisor, indexed by StatusEffect: burn 1/16, poison 1/8, else none
+STATUS_DIVISOR = (0, 0, 16, 8)
+
+# Status effect a move may inflict on hit, and its chance, keyed by move name; read-only like the other tables
+MOVE_STATUS = MappingProxyType({
+    "thunder-wave": (StatusEffect.PARALYSIS, 0.3),
+    "thunderbolt": (StatusEffect.PARALYSIS, 0.3),
+    "flamethrower": (StatusEffect.BURN, 0.1),
+    "fire-blast": (StatusEffect.BURN, 0.1),
+    "poison-powder": (StatusEffect.POISON, 0.3),
+    "sludge-bomb": (StatusEffect.POISON, 0.3),
+})
+
 class Move:
     def __init__(self, name: str, power: int, accuracy: int, pp: int, 
                  move_type: str, damage_class: str, effect: Optional[str] = None):
         self.name = name
+        self.display_name = name.title()
         self.power = power if power else 0
         self.accuracy = accuracy if accuracy else 100
         self.pp = pp
         self.current_pp = pp
         self.type = move_type
+        self.type_id = TYPE_ID.get(move_type)
         self.damage_class = damage_class
         self.effect = effect
+        self.status_effect = MOVE_STATUS.get(name)
+        # Same-type attack bonus in halves (3 = 1.5x, 2 = none), bound by the Pokemon that owns this move
+        self.stab_halves = 2
     
     def can_use(self) -> bool:
         return self.current_pp > 0
@@ -60,12 +118,27 @@ class Move:
             self.current_pp -= 1
 
 class Pokemon:
+    # Fixed attribute set: no per-instance __dict__, and attribute reads skip the dict lookup
+    __slots__ = (
+        'name', 'display_name', 'level', 'types', 'type_ids', 'moves', 'usable_move_idx',
+        'base_hp', 'base_attack', 'base_defense', 'base_special_attack', 'base_special_defense', 'base_speed',
+        'max_hp', 'current_hp', 'attack', 'defense', 'special_attack', 'special_defense', 'speed',
+        'status', 'status_turns', 'is_fainted',
+    )
+    
     def __init__(self, name: str, stats: Dict[str, int], types: List[str], 
                  moves: List[Move], level: int = 50):
         self.name = name
+        self.display_name = name.title()
         self.level = level
         self.types = types
-        self.moves = moves
+        self.type_ids = tuple(TYPE_ID[t] for t in types if t in TYPE_ID)
+        # Own copies: each move carries this Pokemon's PP and STAB, so callers' Move objects may be shared
+        self.moves = [copy.copy(move) for move in moves]
+        for move in self.moves:
+            move.stab_halves = 3 if move.type in types else 2
+        # Indices of moves with PP left, in move order; kept current by use_move
+        self.usable_move_idx = [i for i, move in enumerate(self.moves) if move.can_use()]
         
         # Base stats
         self.base_hp = stats.get('hp', 100)
@@ -97,50 +170,59 @@ class Pokemon:
         """Calculate other stats using simplified Pokémon formula."""
         return int(((2 * base_stat + 31) * self.level) / 100) + 5
     
+    def clone(self) -> "Pokemon":
+        """Copy with its own moves and usable-move list, so PP, HP and status are not shared."""
+        twin = copy.copy(self)
+        twin.moves = [copy.copy(move) for move in self.moves]
+        twin.usable_move_idx = list(self.usable_move_idx)
+        return twin
+    
+    def use_move(self, idx: int) -> Move:
+        """Spend one PP of the move at idx and return it."""
+        move = self.moves[idx]
+        move.use()
+        if move.current_pp <= 0:
+            self.usable_move_idx.remove(idx)
+        return move
+    
     def take_damage(self, damage: int) -> int:
         """Apply damage and return actual damage taken."""
-        actual_damage = min(damage, self.current_hp)
-        self.current_hp -= actual_damage
-        if self.current_hp <= 0:
+        hp = self.current_hp
+        if damage >= hp:
             self.current_hp = 0
             self.is_fainted = True
-        return actual_damage
+            return hp
+        self.current_hp = hp - damage
+        return damage
     
     def apply_status_effect(self, status: StatusEffect, turns: int = 3):
         """Apply a status effect."""
-        if self.status == StatusEffect.NONE:
+        if self.status is StatusEffect.NONE:
             self.status = status
             self.status_turns = turns
     
     def process_status_effects(self) -> Tuple[bool, str]:
         """Process status effects at the end of turn. Returns (can_act, message)."""
-        if self.status == StatusEffect.NONE:
+        status = self.status
+        if status == StatusEffect.NONE:
             return True, ""
         
         message = ""
         can_act = True
         
-        if self.status == StatusEffect.PARALYSIS:
-            if random.random() < 0.25:  # 25% chance to be paralyzed
-                can_act = False
-                message = f"{self.name} is paralyzed and can't move!"
+        if status == StatusEffect.PARALYSIS and RNGPool.next_uniform() < 0.25:  # 25% chance to be paralyzed
+            can_act = False
+            message = f"{self.name} is paralyzed and can't move!"
         
-        elif self.status == StatusEffect.BURN:
-            # Burn damage (1/16 of max HP)
-            burn_damage = max(1, self.max_hp // 16)
-            actual_damage = self.take_damage(burn_damage)
-            message = f"{self.name} is hurt by burn! ({actual_damage} damage)"
-        
-        elif self.status == StatusEffect.POISON:
-            # Poison damage (1/8 of max HP)
-            poison_damage = max(1, self.max_hp // 8)
-            actual_damage = self.take_damage(poison_damage)
-            message = f"{self.name} is hurt by poison! ({actual_damage} damage)"
+        divisor = STATUS_DIVISOR[status]
+        if divisor:
+            actual_damage = self.take_damage(max(1, self.max_hp // divisor))
+            message = f"{self.name} is hurt by {status.name.lower()}! ({actual_damage} damage)"
         
         # Reduce status duration
         self.status_turns -= 1
         if self.status_turns <= 0:
-            old_status = self.status.value
+            old_status = status.name.lower()
             self.status = StatusEffect.NONE
             if message:
                 message += f" {self.name} recovered from {old_status}!"
@@ -177,15 +259,59 @@ class TypeEffectiveness:
     @classmethod
     def get_multiplier(cls, attack_type: str, defend_types: List[str]) -> float:
         """Calculate type effectiveness multiplier."""
-        multiplier = 1.0
+        return cls.get_multiplier_by_id(
+            TYPE_ID.get(attack_type), [TYPE_ID[t] for t in defend_types if t in TYPE_ID]
+        )
+    
+    @classmethod
+    def get_multiplier_by_id(cls, attack_id: Optional[int], defend_ids: Tuple[int, ...]) -> float:
+        """Type effectiveness for pre-resolved type ids; None means an unknown attacking type."""
+        quarters, scale = cls.get_quarters_by_id(attack_id, defend_ids)
+        return quarters / scale
+    
+    @staticmethod
+    def get_quarters_by_id(attack_id: Optional[int], defend_ids: Tuple[int, ...]) -> Tuple[int, int]:
+        """Type effectiveness as an exact (quarters, scale) fraction for pre-resolved type ids."""
+        if attack_id is None:
+            return 1, 1
         
-        for defend_type in defend_types:
-            if attack_type in cls.EFFECTIVENESS:
-                type_chart = cls.EFFECTIVENESS[attack_type]
-                if defend_type in type_chart:
-                    multiplier *= type_chart[defend_type]
+        row = _CHART_ROWS[attack_id]
+        quarters = 1
+        for defend_id in defend_ids:
+            factor = row[defend_id]
+            if not factor:
+                return 0, 1  # Immunity zeroes the product whatever the other type is
+            quarters *= factor
         
-        return multiplier
+        return quarters, 4 ** len(defend_ids)
+
+# Dense attacker x defender chart in quarter units (0 = immune, 2 = 0.5x, 4 = 1x, 8 = 2x)
+TYPE_CHART = np.array(
+    [[round(TypeEffectiveness.EFFECTIVENESS.get(atk, {}).get(dfn, 1.0) * 4) for dfn in TYPE_ID] for atk in TYPE_ID],
+    dtype=np.int8
+)
+TYPE_CHART.flags.writeable = False
+# The same chart as float32 multipliers, for vectorized lookups; quarters are exact in binary
+EFFECTIVENESS_MATRIX = TYPE_CHART.astype(np.float32) / np.float32(4)
+EFFECTIVENESS_MATRIX.flags.writeable = False
+# Scalar lookups index plain Python rows; per-call NumPy indexing costs more than it saves
+_CHART_ROWS = tuple(map(tuple, TYPE_CHART.tolist()))
+
+@lru_cache(maxsize=4096)
+def _base_damage(level: int, power: int, attack_stat: int, defense_stat: int) -> Tuple[int, int]:
+    """Deterministic part of the damage formula, before modifiers, as an exact (numerator, denominator)."""
+    # ((((2 * level / 5 + 2) * power * (Attack/Defense)) / 50) + 2), over the common denominator 250 * Defense
+    return (2 * level + 10) * power * attack_stat + 500 * defense_stat, 250 * defense_stat
+
+def _damage_kernel(numerator, denominator, critical_halves, stab_halves, type_quarters, type_scale, random_percent):
+    """
+    Truncated damage after modifiers, in integer arithmetic only: critical and STAB in halves,
+    type effectiveness as quarters over type_scale, the random factor in percent. Works
+    elementwise on NumPy integer arrays too, so the scalar and batch simulators share it.
+    """
+    return (numerator * critical_halves * stab_halves * type_quarters * random_percent) // (
+        denominator * 4 * type_scale * 100
+    )
 
 class BattleCalculator:
     """Handles battle damage calculations."""
@@ -200,7 +326,7 @@ class BattleCalculator:
             return 0, False, 1.0
         
         # Check if move hits
-        if random.randint(1, 100) > move.accuracy:
+        if RNGPool.next_int(100) + 1 > move.accuracy:
             return 0, False, 1.0  # Move missed
         
         # Determine attack and defense stats
@@ -214,23 +340,21 @@ class BattleCalculator:
             attack_stat = attacker.special_attack
             defense_stat = defender.special_defense
         
-        # Critical hit check (6.25% chance)
-        is_critical = random.random() < 0.0625
-        critical_multiplier = 1.5 if is_critical else 1.0
+        # Critical hit check (6.25% chance), 1.5x as 3 halves
+        is_critical = RNGPool.next_uniform() < 0.0625
+        critical_halves = 3 if is_critical else 2
         
         # Type effectiveness
-        type_multiplier = TypeEffectiveness.get_multiplier(move.type, defender.types)
-        
-        # STAB (Same Type Attack Bonus)
-        stab = 1.5 if move.type in attacker.types else 1.0
+        type_quarters, type_scale = TypeEffectiveness.get_quarters_by_id(move.type_id, defender.type_ids)
         
         # Random factor (85-100%)
-        random_factor = random.randint(85, 100) / 100
+        random_percent = 85 + RNGPool.next_int(16)
         
-        # Damage formula: ((((2 * level / 5 + 2) * power * (Attack/Defense)) / 50) + 2) * modifiers
-        level_factor = (2 * attacker.level / 5 + 2)
-        base_damage = (level_factor * move.power * (attack_stat / defense_stat)) / 50 + 2
+        # Damage formula: base damage (memoized per stat block) * modifiers
+        numerator, denominator = _base_damage(attacker.level, move.power, attack_stat, defense_stat)
         
-        final_damage = int(base_damage * critical_multiplier * stab * type_multiplier * random_factor)
+        final_damage = _damage_kernel(
+            numerator, denominator, critical_halves, move.stab_halves, type_quarters, type_scale, random_percent
+        )
         
-        return max(1, final_damage), is_critical, type_multiplier
+        return max(1, final_damage), is_critical, type_quarters / type_scale